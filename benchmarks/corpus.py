@@ -0,0 +1,106 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""
+Generates synthetic GIT URLs for the benchmarks.
+
+A few hosts serve most URLs, and owners follow a long-tailed distribution, as
+in an index of real remotes.  Run it as a script to write a corpus to a file:
+
+    $ python benchmarks/corpus.py 1000000 > urls.txt
+"""
+
+import random
+import sys
+
+# (host, weight)
+HOSTS = [
+    ('github.com', 60),
+    ('gitlab.com', 15),
+    ('bitbucket.org', 10),
+    ('git.example.com', 8),
+    ('scm.corp.example.net', 5),
+    ('localhost', 2),
+]
+
+# (format, weight), filled in with user, host, port, owner and name.
+SHAPES = [
+    ('https://{host}/{owner}/{name}.git', 35),
+    ('git@{host}:{owner}/{name}.git', 35),
+    ('https://{host}/{owner}/{name}', 10),
+    ('ssh://{user}@{host}:{port}/{owner}/{name}.git', 6),
+    ('git://{host}/{owner}/{name}.git', 4),
+    ('git+ssh://{user}@{host}/{owner}/{name}.git', 3),
+    ('{user}@{host}:/{owner}/{name}.git', 3),
+    ('{host}:{name}.git', 2),
+    ('not a valid URL {name}', 2),
+]
+
+OWNERS = 5000
+NAMES = [
+    'api', 'web', 'infra', 'docs', 'tools', 'ansible-etcd', 'molecule',
+    'config', 'service', 'client', 'server', 'sdk', 'cli', 'core'
+]
+
+
+def generate(count, seed=0):
+    """
+    Returns a list of `count` URLs, the same for the same seed.
+
+    :param count: The number of URLs.
+    :param seed: The seed of the random number generator.
+    :returns: list
+    """
+    rng = random.Random(seed)
+    hosts, host_weights = zip(*HOSTS)
+    shapes, shape_weights = zip(*SHAPES)
+    urls = []
+    for _ in range(count):
+        host = _choice(rng, hosts, host_weights)
+        shape = _choice(rng, shapes, shape_weights)
+        # A Pareto draw gives a few owners most of the repositories.
+        owner = 'owner{}'.format(int(rng.paretovariate(1.2)) % OWNERS)
+        name = '{}-{}'.format(rng.choice(NAMES), rng.randrange(1000))
+        urls.append(
+            shape.format(
+                user=rng.choice(['git', 'git', 'git', 'deploy']),
+                host=host,
+                port=rng.choice([22, 2222, 29418]),
+                owner=owner,
+                name=name))
+
+    return urls
+
+
+def _choice(rng, values, weights):
+    point = rng.uniform(0, sum(weights))
+    for value, weight in zip(values, weights):
+        point -= weight
+        if point <= 0:
+            return value
+
+    return values[-1]
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for url in generate(count):
+        sys.stdout.write(url + '\n')
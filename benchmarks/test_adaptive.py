@@ -0,0 +1,43 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from giturlparse import parser
+
+# Workloads skewed towards one shape, where the fast path parses almost all
+# URLs or almost none.
+WORKLOADS = {
+    'scp': ['git@github.com:owner/repo{}.git'.format(i) for i in range(10000)],
+    'short': ['example.com:repo{}.git'.format(i) for i in range(10000)],
+    'git+ssh': [
+        'git+ssh://git@example.com/owner/repo{}.git'.format(i)
+        for i in range(10000)
+    ],
+}
+
+
+@pytest.mark.benchmark(group='adaptive')
+@pytest.mark.parametrize('workload', sorted(WORKLOADS))
+@pytest.mark.parametrize('adaptive', [False, True], ids=['fixed', 'adaptive'])
+def test_parse_many_skewed(benchmark, workload, adaptive):
+    benchmark(parser.parse_many, WORKLOADS[workload], adaptive=adaptive)
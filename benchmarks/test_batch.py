@@ -0,0 +1,96 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from giturlparse import parser
+
+
+def _parse_loop(urls):
+    results = []
+    for url in urls:
+        try:
+            results.append(parser.Parser(url).parse())
+        except parser.ParserError as e:
+            results.append(e)
+
+    return results
+
+
+@pytest.mark.benchmark(group='batch')
+def test_parse_loop(benchmark, urls):
+    benchmark(_parse_loop, urls)
+
+
+@pytest.mark.benchmark(group='batch')
+def test_parse_many(benchmark, urls):
+    benchmark(parser.parse_many, urls)
+
+
+@pytest.mark.benchmark(group='batch')
+def test_parse_many_corpus(benchmark, corpus_urls):
+    benchmark(parser.parse_many, corpus_urls)
+
+
+def _parse_many_transposed(urls):
+    parsed = [
+        r for r in parser.parse_many(urls) if not isinstance(r, Exception)
+    ]
+
+    return dict(zip(parser.Parsed._fields, zip(*parsed)))
+
+
+@pytest.mark.benchmark(group='columnar')
+def test_parse_many_transposed(benchmark, corpus_urls):
+    benchmark(_parse_many_transposed, corpus_urls)
+
+
+@pytest.mark.benchmark(group='columnar')
+def test_parse_many_columnar(benchmark, corpus_urls):
+    benchmark(
+        parser.parse_many,
+        corpus_urls,
+        columnar=True,
+        dictionary=('protocol', 'resource'))
+
+
+def _rewrite_by_reparsing(urls):
+    # Rewriting `href` by hand, and parsing again to check the result.
+    results = []
+    for parsed in parser.parse_many(urls):
+        if isinstance(parsed, Exception):
+            continue
+        url = 'git@{}:{}.git'.format(parsed.resource,
+                                     parsed.pathname.strip('/')[:-4])
+        results.append(parser.try_parse(url))
+
+    return results
+
+
+@pytest.mark.benchmark(group='rewrite')
+def test_rewrite_by_reparsing(benchmark, corpus_urls):
+    benchmark(_rewrite_by_reparsing, corpus_urls)
+
+
+@pytest.mark.benchmark(group='rewrite')
+def test_rewrite_many(benchmark, corpus_urls):
+    benchmark(parser.rewrite_many, corpus_urls, 'ssh')
@@ -0,0 +1,49 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import subprocess
+import sys
+
+import pytest
+
+
+def _import():
+    subprocess.check_call([sys.executable, '-c', 'import giturlparse'])
+
+
+def _import_time_us():
+    # The cumulative time of importing giturlparse, as reported by Python.
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', 'import giturlparse'],
+        stderr=subprocess.STDOUT,
+        universal_newlines=True)
+    for line in output.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if fields[-1] == 'giturlparse':
+            return int(fields[1])
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='needs -X importtime')
+@pytest.mark.benchmark(group='import')
+def test_import_time(benchmark):
+    benchmark.extra_info['import_time_us'] = _import_time_us()
+    benchmark.pedantic(_import, rounds=10)
@@ -0,0 +1,62 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from giturlparse import parser
+
+# A URL matched by each of `POSSIBLE_REGEXES` in turn, and one matched by
+# none, so a slowdown in a single branch shows up on its own.
+BRANCH_URLS = [
+    'https://github.com/owner/repo.git',
+    'git+ssh://example.com:9999/owner/repo.git',
+    'git@github.com:owner/repo.git',
+    'example.com:repo.git',
+    'not a valid URL',
+]
+
+
+def _parse(url, fast_path):
+    try:
+        return parser.Parser(url, fast_path).parse()
+    except parser.ParserError:
+        pass
+
+
+@pytest.mark.benchmark(group='latency')
+@pytest.mark.parametrize(
+    'url', BRANCH_URLS, ids=['first', 'second', 'third', 'fourth', 'invalid'])
+@pytest.mark.parametrize('fast_path', [True, False], ids=['fast', 'regex'])
+def test_parse_latency(benchmark, url, fast_path):
+    parser.precompile()
+    benchmark(_parse, url, fast_path)
+
+
+@pytest.mark.benchmark(group='reuse')
+def test_parser_per_url(benchmark):
+    benchmark(lambda: parser.Parser(BRANCH_URLS[0]).parse())
+
+
+@pytest.mark.benchmark(group='reuse')
+def test_reused_parser(benchmark):
+    parse = parser.Parser().parse
+    benchmark(parse, BRANCH_URLS[0])
@@ -0,0 +1,61 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import tracemalloc
+
+import pytest
+
+from giturlparse import parser
+
+URLS = [
+    'https://github.com/owner{}/repo{}.git'.format(i % 100, i)
+    for i in range(10000)
+]
+
+OPTIONS = [
+    {},
+    dict(compact=True),
+    dict(intern=True),
+    dict(columnar=True, dictionary=('protocol', 'resource')),
+]
+
+
+def _bytes_per_result(options):
+    urls = list(URLS)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        results = parser.parse_many(urls, **options)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del results
+
+    return (after - before) // len(urls)
+
+
+@pytest.mark.benchmark(group='memory')
+@pytest.mark.parametrize(
+    'options', OPTIONS, ids=['parsed', 'compact', 'interned', 'columnar'])
+def test_result_memory(benchmark, options):
+    benchmark.extra_info['bytes_per_result'] = _bytes_per_result(options)
+    benchmark(parser.parse_many, URLS, **options)
@@ -0,0 +1,47 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import multiprocessing
+
+import pytest
+
+from giturlparse import parser
+
+_CPUS = multiprocessing.cpu_count()
+
+
+@pytest.fixture(scope='module')
+def many_urls():
+    return [
+        'https://github.com/owner{}/repo{}.git'.format(i % 1000, i)
+        for i in range(2000000)
+    ]
+
+
+# Each run parses a couple of million URLs, so it's only run once.  Compare
+# the time per worker count for the speedup.
+@pytest.mark.benchmark(group='parallel')
+@pytest.mark.parametrize('workers', sorted({1, 2, _CPUS}))
+def test_parse_many_parallel(benchmark, many_urls, workers):
+    benchmark.extra_info['workers'] = workers
+    benchmark.pedantic(
+        parser.parse_many, (many_urls, ), {'workers': workers}, rounds=1)
@@ -0,0 +1,56 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from giturlparse import parser
+
+# Inputs which made the patterns backtrack before they were made linear.
+PATHOLOGICAL_INPUTS = [
+    'a@' * 16000,
+    'http://' + 'a@' * 16000 + '!',
+    'a@/' * 16000 + 'x.gi',
+    'a@b:' + 'a/' * 16000 + 'x.git!',
+    'git+ssh://' + 'a.' * 16000 + '!',
+    'a://h:' + '1' * 16000 + '!',
+    'a:/' * 16000 + '!',
+]
+
+
+def _parse(url):
+    try:
+        return parser.Parser(url).parse()
+    except parser.ParserError:
+        pass
+
+
+@pytest.mark.benchmark(group='worst-case')
+@pytest.mark.parametrize('url', PATHOLOGICAL_INPUTS, ids=lambda url: url[:8])
+def test_parse_pathological(benchmark, url):
+    benchmark(_parse, url)
+
+
+@pytest.mark.benchmark(group='worst-case')
+@pytest.mark.parametrize(
+    'text', PATHOLOGICAL_INPUTS, ids=lambda text: text[:8])
+def test_finditer_pathological(benchmark, text):
+    benchmark(lambda: list(parser.finditer(text)))
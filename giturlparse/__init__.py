@@ -20,15 +20,130 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import sys
+
+from giturlparse import cache
 from giturlparse import parser
 
-import pbr.version
+_cache = cache.ParseCache()
+
+
+def _load_version():
+    import pbr.version
+
+    version_info = pbr.version.VersionInfo('git-url-parse')
+    globals().update(
+        version_info=version_info,
+        __version__=version_info.release_string(),
+    )
+
 
-version_info = pbr.version.VersionInfo('git-url-parse')
-__version__ = version_info.release_string()
+# pbr is only imported when the version is first asked for, so that parsing
+# doesn't pay for it.  Module `__getattr__` needs Python 3.7.
+if sys.version_info < (3, 7):  # pragma: no cover
+    _load_version()
+else:
+
+    def __getattr__(name):
+        if name in ('version_info', '__version__'):
+            _load_version()
+            return globals()[name]
+
+        msg = "module '{}' has no attribute '{}'".format(__name__, name)
+        raise AttributeError(msg)
 
 
 def parse(url):  # pragma: no cover
-    p = parser.Parser(url)
+    return _cache.parse(url)
+
+
+def try_parse(url):  # pragma: no cover
+    return _cache.try_parse(url)
+
+
+def parse_many(urls,
+               fast_path=True,
+               compact=False,
+               workers=1,
+               chunk_size=parser.PARALLEL_CHUNK_SIZE,
+               adaptive=False,
+               intern=False,
+               columnar=False,
+               dictionary=()):  # pragma: no cover
+    return parser.parse_many(urls, fast_path, compact, workers, chunk_size,
+                             adaptive, intern, columnar, dictionary)
+
+
+def parse_stream(fileobj,
+                 fast_path=True,
+                 compact=False,
+                 chunk_size=parser.STREAM_CHUNK_SIZE,
+                 workers=1,
+                 adaptive=False):  # pragma: no cover
+    return parser.parse_stream(fileobj, fast_path, compact, chunk_size,
+                               workers, adaptive)
+
+
+def aparse_many(urls,
+                fast_path=True,
+                compact=False,
+                chunk_size=1024,
+                executor=None,
+                max_pending=1):  # pragma: no cover
+    # Imported here, so that asyncio is only loaded by those who use it.
+    from giturlparse import aio
+
+    return aio.aparse_many(urls, fast_path, compact, chunk_size, executor,
+                           max_pending)
+
+
+def aparse_iter(urls,
+                fast_path=True,
+                compact=False,
+                chunk_size=1024,
+                executor=None,
+                max_pending=1):  # pragma: no cover
+    from giturlparse import aio
+
+    return aio.aparse_iter(urls, fast_path, compact, chunk_size, executor,
+                           max_pending)
+
+
+def rewrite_many(urls, protocol, user=None, port=None,
+                 fast_path=True):  # pragma: no cover
+    return parser.rewrite_many(urls, protocol, user, port, fast_path)
+
+
+def parse_spans(buf, start=0, end=None):  # pragma: no cover
+    return parser.parse_spans(buf, start, end)
+
+
+def finditer(text, fast_path=True):  # pragma: no cover
+    return parser.finditer(text, fast_path)
+
+
+def precompile():  # pragma: no cover
+    parser.precompile()
+
+
+def register_host(resource, profile):  # pragma: no cover
+    parser.register_host(resource, profile)
+    # URLs on the host may have been cached with another result.
+    _cache.cache_clear()
+
+
+def unregister_host(resource):  # pragma: no cover
+    parser.unregister_host(resource)
+    _cache.cache_clear()
+
+
+def cache_info():  # pragma: no cover
+    return _cache.cache_info()
+
+
+def cache_clear():  # pragma: no cover
+    _cache.cache_clear()
+
 
-    return p.parse()
+def set_cache_maxsize(maxsize):  # pragma: no cover
+    _cache.maxsize = maxsize
@@ -0,0 +1,129 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# Parsing for asyncio applications, which hands control back to the event loop
+# between chunks of URLs, or parses them in an executor.  Needs Python 3.6.
+
+import asyncio
+import collections
+import itertools
+
+from giturlparse import parser
+
+# URLs parsed between two returns to the event loop.
+CHUNK_SIZE = 1024
+
+
+async def aparse_many(urls,
+                      fast_path=True,
+                      compact=False,
+                      chunk_size=CHUNK_SIZE,
+                      executor=None,
+                      max_pending=1):
+    """
+    The coroutine version of :func:`giturlparse.parser.parse_many`, which
+    parses `chunk_size` URLs at a time and lets other tasks run in between.
+
+    :param urls: An iterable or async iterable of GIT URL strings.
+    :param fast_path: Parse common URL shapes without regular expressions.
+    :param compact: Return `CompactParsed` objects instead of `Parsed` ones.
+    :param chunk_size: The number of URLs parsed at a time.
+    :param executor: A `concurrent.futures` executor to parse chunks in, or
+     None to parse them in the event loop.
+    :param max_pending: The number of chunks handed to the executor at once.
+    :returns: list
+    """
+    results = []
+    async for chunk_results in _aparse_chunks(
+            urls, fast_path, compact, chunk_size, executor, max_pending):
+        results.extend(chunk_results)
+
+    return results
+
+
+async def aparse_iter(urls,
+                      fast_path=True,
+                      compact=False,
+                      chunk_size=CHUNK_SIZE,
+                      executor=None,
+                      max_pending=1):
+    """
+    Like :func:`.aparse_many`, but an async iterator over the results.  URLs
+    are only read from `urls` as results are consumed, at most
+    `max_pending` chunks ahead.
+
+    :returns: async generator
+    """
+    chunks = _aparse_chunks(urls, fast_path, compact, chunk_size, executor,
+                            max_pending)
+    try:
+        async for chunk_results in chunks:
+            for result in chunk_results:
+                yield result
+    finally:
+        # Cancel the chunks in progress now, rather than when collected.
+        await chunks.aclose()
+
+
+async def _aparse_chunks(urls, fast_path, compact, chunk_size, executor,
+                         max_pending):
+    pending = collections.deque()
+    try:
+        async for chunk in _chunks(urls, chunk_size):
+            pending.append(
+                asyncio.ensure_future(
+                    _parse_chunk(chunk, fast_path, compact, executor)))
+            if len(pending) >= max_pending:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def _parse_chunk(urls, fast_path, compact, executor):
+    if executor is None:
+        # Let other tasks run before taking up the loop again.
+        await asyncio.sleep(0)
+        return parser.parse_many(urls, fast_path, compact)
+
+    loop = asyncio.get_event_loop()
+
+    return await loop.run_in_executor(executor, parser.parse_many, urls,
+                                      fast_path, compact)
+
+
+async def _chunks(urls, size):
+    if not hasattr(urls, '__aiter__'):
+        iterator = iter(urls)
+        for chunk in iter(lambda: list(itertools.islice(iterator, size)), []):
+            yield chunk
+        return
+
+    chunk = []
+    async for url in urls:
+        chunk.append(url)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
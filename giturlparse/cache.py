@@ -0,0 +1,149 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+
+import collections
+import threading
+
+from giturlparse import parser
+
+DEFAULT_MAXSIZE = 1024
+
+# Cached for URLs which can't be parsed.
+_INVALID = object()
+
+CacheInfo = collections.namedtuple('CacheInfo', [
+    'hits',
+    'misses',
+    'evictions',
+    'maxsize',
+    'currsize',
+])
+
+
+class ParseCache(object):
+    """
+    A thread-safe, size-bounded LRU cache of parse results keyed on the URL
+    string.  Invalid URLs are cached too, so a known-bad string raises
+    :class:`.ParserError` again without being re-parsed.
+
+    Cached `Parsed` objects are shared between callers and must not be
+    mutated.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self._maxsize = _check_maxsize(maxsize)
+        self._lock = threading.Lock()
+        self._data = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        maxsize = _check_maxsize(maxsize)
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def parse(self, url):
+        """
+        Parses a GIT URL, returning the cached result when there is one.
+
+        :returns: Parsed object
+        :raise: :class:`.ParserError`
+        """
+        result = self._get(url)
+        if result is _INVALID:
+            raise parser._error(url)
+
+        return result
+
+    def try_parse(self, url):
+        """
+        Like :meth:`.parse`, but returns None for an invalid URL instead of
+        raising.
+
+        :returns: Parsed object or None
+        """
+        result = self._get(url)
+        if result is _INVALID:
+            return None
+
+        return result
+
+    def _get(self, url):
+        with self._lock:
+            result = self._data.pop(url, None)
+            if result is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._data[url] = result
+
+        if result is None:
+            result = parser.try_parse(url)
+            if result is None:
+                result = _INVALID
+            self._store(url, result)
+
+        return result
+
+    def cache_info(self):
+        """
+        Returns the cache statistics.
+
+        :returns: CacheInfo object
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions,
+                             self._maxsize, len(self._data))
+
+    def cache_clear(self):
+        """ Empties the cache and resets its statistics. """
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def _store(self, url, result):
+        with self._lock:
+            if self._maxsize > 0:
+                self._data[url] = result
+                self._evict()
+
+    def _evict(self):
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+
+def _check_maxsize(maxsize):
+    if maxsize < 0:
+        msg = "Cache maxsize can't be negative: {}".format(maxsize)
+        raise ValueError(msg)
+
+    return maxsize
@@ -0,0 +1,183 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import argparse
+import collections
+import csv
+import itertools
+import json
+import sys
+import time
+
+from giturlparse import parser
+
+FORMATS = ('jsonl', 'csv', 'tsv')
+
+# Results are written this many at a time.
+OUTPUT_BATCH_SIZE = 4096
+
+
+def main(argv=None):
+    """
+    Parses the GIT URLs in files, one per line, and writes the results to
+    stdout.  Invalid URLs are reported on stderr.
+
+    :param argv: The command-line arguments, or None for `sys.argv`.
+    :returns: int, the exit status: 1 if any URL is invalid or any file
+     can't be read, otherwise 0
+    """
+    args = _parse_args(argv)
+    write = _writer(args.format, args.fields, sys.stdout)
+    count = errors = 0
+    start = time.time()
+    for name in args.files or ['-']:
+        if name == '-':
+            name, fileobj = '<stdin>', _stdin()
+        else:
+            try:
+                fileobj = open(name, 'rb')
+            except (IOError, OSError) as e:
+                errors += 1
+                sys.stderr.write('giturlparse: {}: {}\n'.format(
+                    name, e.strerror))
+                continue
+        try:
+            results = parser.parse_stream(
+                fileobj, workers=args.workers or None, adaptive=True)
+            for batch in _batches(results, OUTPUT_BATCH_SIZE):
+                parsed = []
+                for lineno, result in batch:
+                    if isinstance(result, parser.ParserError):
+                        errors += 1
+                        sys.stderr.write('{}:{}: {}\n'.format(
+                            name, lineno, result))
+                    else:
+                        parsed.append(result)
+                count += len(batch)
+                write(parsed)
+        finally:
+            if fileobj is not _stdin():
+                fileobj.close()
+    sys.stdout.flush()
+
+    if not args.quiet:
+        elapsed = time.time() - start
+        rate = count / elapsed if elapsed else 0
+        sys.stderr.write(
+            '{} URLs in {:.2f}s ({:.0f} URLs/s), {} errors\n'.format(
+                count, elapsed, rate, errors))
+
+    return 1 if errors else 0
+
+
+def _parse_args(argv):
+    argparser = argparse.ArgumentParser(
+        prog='giturlparse',
+        description='Parse GIT URLs, one per line, from files or stdin.')
+    argparser.add_argument(
+        'files',
+        nargs='*',
+        metavar='FILE',
+        help="files to read, which may be gzipped; '-' or none for stdin")
+    argparser.add_argument(
+        '-f',
+        '--format',
+        choices=FORMATS,
+        default='jsonl',
+        help='output format (default: %(default)s)')
+    argparser.add_argument(
+        '--fields',
+        type=_fields,
+        default=parser.Parsed._fields,
+        help='comma-separated fields to write (default: all)')
+    argparser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        default=1,
+        help='processes to parse in, 0 for one per CPU (default: 1)')
+    argparser.add_argument(
+        '-q',
+        '--quiet',
+        action='store_true',
+        help="don't print a summary on stderr")
+
+    return argparser.parse_args(argv)
+
+
+def _fields(value):
+    fields = tuple(value.split(','))
+    unknown = set(fields) - set(parser.Parsed._fields)
+    if unknown:
+        msg = 'unknown fields: {}'.format(', '.join(sorted(unknown)))
+        raise argparse.ArgumentTypeError(msg)
+
+    return fields
+
+
+def _stdin():
+    # Read stdin as bytes where possible, so gzipped input can be detected.
+    return getattr(sys.stdin, 'buffer', sys.stdin)
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+
+    return iter(lambda: list(itertools.islice(iterator, size)), [])
+
+
+def _writer(output_format, fields, out):
+    # Returns a function writing a list of results to `out`.
+    if output_format == 'jsonl':
+
+        def write(results):
+            out.write(''.join(
+                _json_line(result, fields) for result in results))
+
+        return write
+
+    delimiter = ',' if output_format == 'csv' else '\t'
+    writer = csv.writer(out, delimiter=delimiter, lineterminator='\n')
+    writer.writerow(fields)
+
+    def write(results):
+        writer.writerows(_flat_row(result, fields) for result in results)
+
+    return write
+
+
+def _row(result, fields):
+    return [getattr(result, field) for field in fields]
+
+
+def _json_line(result, fields):
+    row = collections.OrderedDict(zip(fields, _row(result, fields)))
+
+    return json.dumps(row) + '\n'
+
+
+def _flat_row(result, fields):
+    # CSV has no lists, so the protocols are joined as in the URL.
+    return [
+        '+'.join(value) if field == 'protocols' else value
+        for field, value in zip(fields, _row(result, fields))
+    ]
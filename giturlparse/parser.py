@@ -20,47 +20,469 @@
 #  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
 
+import array
+import codecs
 import collections
+import itertools
+import multiprocessing
 import re
+import struct
+import timeit
+import zlib
 
-Parsed = collections.namedtuple('Parsed', [
-    'pathname',
-    'protocols',
-    'protocol',
-    'href',
-    'resource',
-    'user',
-    'port',
-    'name',
-    'owner',
-])
+# Identifies a repository, whichever URL it's reached by.
+RepoKey = collections.namedtuple('RepoKey', ['host', 'owner', 'name'])
 
+
+class Parsed(
+        collections.namedtuple('Parsed', [
+            'pathname',
+            'protocols',
+            'protocol',
+            'href',
+            'resource',
+            'user',
+            'port',
+            'name',
+            'owner',
+        ])):
+    __slots__ = ()
+
+    def canonical_key(self):
+        """
+        Returns the repository the URL points to, so that URLs for the same
+        repository over different protocols compare and hash equal.  The
+        host, owner and name are lowercased, and a '.git' suffix is dropped
+        from the name.  The user and port are left out.
+
+        :returns: RepoKey object
+        """
+        return _canonical_key(self.resource, self.owner, self.name)
+
+    def format(self, protocol, user=None, port=None):
+        """
+        Returns a clone URL of the repository over `protocol`, built from the
+        fields already parsed, so it doesn't need parsing again.  The user
+        and port of the URL aren't carried over, since they depend on the
+        protocol.  An SSH URL without a port is SCP-like.
+
+        :param protocol: One of 'https', 'http', 'git' or 'ssh'.
+        :param user: The user to put in the URL, '' for none, or None for
+         'git' over SSH and none otherwise.
+        :param port: The port to put in the URL, or None.
+        :returns: str
+        :raise: ValueError if the protocol is unknown, or the URL has no name
+        """
+        return _format(self.resource, self.owner, self.name, protocol, user,
+                       port)
+
+    def to_ssh(self, user=None, port=None):
+        """
+        Returns an SSH clone URL of the repository, such as
+        'git@github.com:owner/repo.git'.
+
+        :returns: str
+        :raise: ValueError if the URL has no name
+        """
+        return self.format('ssh', user, port)
+
+    def to_https(self, user=None, port=None):
+        """
+        Returns an HTTPS clone URL of the repository, such as
+        'https://github.com/owner/repo.git'.
+
+        :returns: str
+        :raise: ValueError if the URL has no name
+        """
+        return self.format('https', user, port)
+
+
+# The result of `parse_spans`: the (start, end) offsets of each field in the
+# buffer, or None.
+ParsedSpans = collections.namedtuple('ParsedSpans', Parsed._fields)
+
+# The result of `parse_many` with `columnar=True`.  `columns` maps each field
+# of `Parsed` to a list of its values, or for a dictionary-encoded field to an
+# array of indexes into `dictionaries[field]`, with -1 for None.  `valid` is
+# an array of 1 for each URL parsed and 0 for each invalid one, whose fields
+# are all None.
+ParsedColumns = collections.namedtuple('ParsedColumns',
+                                       ['columns', 'valid', 'dictionaries'])
+
+# The fields of `Parsed` which are slices of `href`, in the order they appear
+# in it, as kept by `CompactParsed`.
+_SPAN_FIELDS = ('user', 'resource', 'port', 'pathname', 'owner', 'name')
+_SPANS = struct.Struct('{}i'.format(2 * len(_SPAN_FIELDS)))
+_SPAN = struct.Struct('2i')
+
+
+def _span_property(index):
+    offset = index * _SPAN.size
+
+    def get(self):
+        start, end = _SPAN.unpack_from(self._spans, offset)
+        if start == -1:
+            return None
+
+        return self.href[start:end]
+
+    return property(get)
+
+
+class CompactParsed(object):
+    """
+    A `Parsed` look-alike for holding many results in memory.  Rather than a
+    copy of each field, it keeps the URL and the offsets of the fields in it,
+    and slices a field out when it's accessed.
+    """
+
+    __slots__ = ('href', 'protocol', '_spans')
+    _fields = Parsed._fields
+
+    def __init__(self, parsed):
+        self.href = parsed.href
+        self.protocol = _PROTOCOLS.get(parsed.protocol, parsed.protocol)
+
+        spans = []
+        start = 0
+        for field in _SPAN_FIELDS:
+            value = getattr(parsed, field)
+            if value is None:
+                spans += [-1, -1]
+                continue
+            # Owner and name are looked up within the pathname.
+            start = self.href.index(value, start)
+            spans += [start, start + len(value)]
+            if field != 'pathname':
+                start += len(value)
+        self._spans = _SPANS.pack(*spans)
+
+    @classmethod
+    def _from_spans(cls, href, protocol, spans):
+        self = cls.__new__(cls)
+        self.href = href
+        self.protocol = protocol
+        self._spans = spans
+
+        return self
+
+    user = _span_property(0)
+    resource = _span_property(1)
+    port = _span_property(2)
+    pathname = _span_property(3)
+    owner = _span_property(4)
+    name = _span_property(5)
+
+    @property
+    def protocols(self):
+        return _get_protocols(self.href)
+
+    def canonical_key(self):
+        """
+        Returns the repository the URL points to, as
+        :meth:`.Parsed.canonical_key` does.
+
+        :returns: RepoKey object
+        """
+        return _canonical_key(self.resource, self.owner, self.name)
+
+    def format(self, protocol, user=None, port=None):
+        """
+        Returns a clone URL of the repository over `protocol`, as
+        :meth:`.Parsed.format` does.
+
+        :returns: str
+        """
+        return _format(self.resource, self.owner, self.name, protocol, user,
+                       port)
+
+    def to_ssh(self, user=None, port=None):
+        return self.format('ssh', user, port)
+
+    def to_https(self, user=None, port=None):
+        return self.format('https', user, port)
+
+    def _asdict(self):
+        return Parsed(*self)._asdict()
+
+    def __iter__(self):
+        for field in self._fields:
+            yield getattr(self, field)
+
+    def __eq__(self, other):
+        if isinstance(other, (Parsed, CompactParsed)):
+            return tuple(self) == tuple(other)
+
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+
+        return not result
+
+    def __hash__(self):
+        # The same as an equal `Parsed`.
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return 'CompactParsed({})'.format(', '.join(
+            '{}={!r}'.format(field, value)
+            for field, value in zip(self._fields, self)))
+
+
+class _LazyPattern(object):
+    """
+    A regular expression compiled the first time it's used, for the patterns
+    most processes never need.
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self._regex = None
+
+    def compile(self):
+        if self._regex is None:
+            self._regex = re.compile(self.pattern)
+            # Later calls go straight to the compiled pattern.
+            self.search = self._regex.search
+            self.match = self._regex.match
+
+        return self._regex
+
+    def search(self, string, *args):
+        return self.compile().search(string, *args)
+
+    def match(self, string, *args):
+        return self.compile().match(string, *args)
+
+    def __getattr__(self, name):
+        return getattr(self.compile(), name)
+
+
+# The lookaheads keep each quantifier from giving back characters that can't
+# lead to a match, so every pattern runs in time linear in the URL length.
+# The second and fourth patterns are compiled on first use.
 POSSIBLE_REGEXES = (
     re.compile(r'^(?P<protocol>https?|git|ssh|rsync)\://'
-               r'(?:(?P<user>.+)@)*'
-               r'(?P<resource>[a-z0-9_.-]*)'
+               r'(?:(?P<user>.+)@)?'
+               r'(?P<resource>[a-z0-9_.-]*)(?![a-z0-9_.-])'
                r'[:/]*'
                r'(?P<port>[\d]+){0,1}'
                r'(?P<pathname>\/((?P<owner>[\w\-]+)\/)?'
                r'((?P<name>[\w\-\.]+?)(\.git|\/)?)?)$'),
-    re.compile(r'(git\+)?'
-               r'((?P<protocol>\w+)://)'
-               r'((?P<user>\w+)@)?'
-               r'((?P<resource>[\w\.\-]+))'
-               r'(:(?P<port>\d+))?'
-               r'(?P<pathname>(\/(?P<owner>\w+)/)?'
-               r'(\/?(?P<name>[\w\-]+)(\.git|\/)?)?)$'),
-    re.compile(r'^(?:(?P<user>.+)@)*'
-               r'(?P<resource>[a-z0-9_.-]*)[:]*'
-               r'(?P<port>[\d]+){0,1}'
-               r'(?P<pathname>\/?(?P<owner>.+)/(?P<name>.+).git)$'),
-    re.compile(r'((?P<user>\w+)@)?'
-               r'((?P<resource>[\w\.\-]+))'
-               r'[\:\/]{1,2}'
-               r'(?P<pathname>((?P<owner>\w+)/)?'
-               r'((?P<name>[\w\-]+)(\.git|\/)?)?)$'),
+    _LazyPattern(r'(?:(git\+)|(?<!\w))'
+                 r'((?P<protocol>\w+)://)'
+                 r'((?P<user>\w+)@)?'
+                 r'((?P<resource>[\w\.\-]+)(?![\w\.\-]))'
+                 r'(:(?P<port>\d+)(?!\d))?'
+                 r'(?P<pathname>(\/(?P<owner>\w+)/)?'
+                 r'(\/?(?P<name>[\w\-]+)(\.git|\/)?)?)$'),
+    re.compile(r'^(?:(?P<user>.+)@)?'
+               r'(?=[^@\n]*/[^/\n]*..git$)'
+               r'(?P<resource>[a-z0-9_.-]*)(?![a-z0-9_.-])'
+               r'[:]*(?!:)'
+               r'(?P<port>[\d]+(?!\d)){0,1}'
+               r'(?P<pathname>\/?(?P<owner>.+)/(?P<name>[^/\n]*.).git)$'),
+    _LazyPattern(r'(?:(?<!\w)(?P<user>\w+)@|(?<![\w\.\-]))'
+                 r'(?P<resource>[\w\.\-]+)'
+                 r'[\:\/]{1,2}'
+                 r'(?P<pathname>((?P<owner>\w+)/)?'
+                 r'((?P<name>[\w\-]+)(\.git|\/)?)?)$'),
 )
 
+# The same patterns for bytes-like input, where only ASCII characters count
+# as word characters.
+_BYTES_REGEXES = tuple(
+    _LazyPattern(regex.pattern.encode('ascii')) for regex in POSSIBLE_REGEXES)
+_BYTES_SEPARATOR = re.compile(br'://')
+
+# What `finditer` takes for a URL in text: one with a scheme, `user@host:path`
+# or `host:path.git`, up to whitespace, quotes, brackets and other characters
+# that can't be part of one.  A URL only starts where a word does, so each
+# character is looked at a bounded number of times, and the patterns above
+# only run on what this matches.
+_URL_IN_TEXT = _LazyPattern(r'(?<![\w+.@-])(?:'
+                            r'[a-zA-Z][\w+.-]*://'
+                            r'(?:[^\s/@{0}]*@)?[^\s/@{0}]*(?:/[^\s@{0}]*)?'
+                            r'|[\w.-]+@[\w.-]+:[^\s@{0}]+'
+                            r'|[\w.-]+:/?(?:[\w.-]+/)*[\w.-]+\.git(?![\w./-])'
+                            r')'.format(r'\'"<>()\[\]{}`,;#?'))
+_URL_TRAILER = '.:!'
+
+# Each pattern can only match URLs with a certain shape: the first needs one
+# of its schemes as a prefix, the second a '://' separator, and the third a
+# '/' and a trailing 'git'.  Checking the shape first lets `_match` skip the
+# patterns that can't match, while still trying the rest in the same order.
+_FIRST_PREFIXES = ('http://', 'https://', 'git://', 'ssh://', 'rsync://')
+_THIRD_SUFFIXES = ('git', 'git\n')
+_CANDIDATES = {
+    (0, True): POSSIBLE_REGEXES,
+    (0, False): POSSIBLE_REGEXES[:2] + POSSIBLE_REGEXES[3:],
+    (1, True): POSSIBLE_REGEXES[1:],
+    (1, False): POSSIBLE_REGEXES[1:2] + POSSIBLE_REGEXES[3:],
+    (2, True): POSSIBLE_REGEXES[2:],
+    (2, False): POSSIBLE_REGEXES[3:],
+}
+
+# The start of the pattern of a `HostProfile`: the scheme, user, resource and
+# port of a URL, or of an SCP-like URL without a scheme.  The path pattern
+# of the profile follows.  Digits after a ':' are always the port, and only
+# an SCP-like URL has a ':' without one, so a path the profile can't match
+# falls back to `POSSIBLE_REGEXES` rather than taking in the port.
+_PROFILE_URL = (r'(?:(?:git\+)?(?P<protocol>\w+)://)?'
+                r'(?:(?P<user>[^@/\s]+)@)?'
+                r'(?P<resource>[a-z0-9_.-]+)'
+                r'(?::(?P<port>\d+)(?=/)'
+                r'|(?(protocol)(?=/)|(?::(?!\d+/)|(?=/))))'
+                r'(?P<pathname>/?{}/?)$')
+
+
+class HostProfile(object):
+    """
+    How the paths of URLs on a host divide into an owner and a name, for hosts
+    whose paths aren't a plain `owner/name`.  `path` is a regular expression
+    for the path after the host and port, with `owner` and `name` groups, and
+    without the leading or trailing '/'.  URLs on a host registered with
+    :func:`.register_host` are parsed with the profile instead of
+    `POSSIBLE_REGEXES`, unless it doesn't match them.  `fast_path` tells
+    whether the profile parses the `owner/name` URLs of the fast path the
+    same way it does, in which case they're left to it.  `templates` maps a
+    protocol to the clone URL :meth:`.Parsed.format` gives for it, with the
+    same fields as `_TEMPLATES`, and the owner and name.  `protocols` are the
+    protocols the host serves, if not all of them, and formatting a URL over
+    another raises ValueError.  `canonical_host` is the host in the
+    :meth:`.Parsed.canonical_key` of its URLs, for hosts which serve the same
+    repositories under several names.
+    """
+
+    def __init__(self,
+                 path,
+                 fast_path=False,
+                 templates=None,
+                 protocols=None,
+                 canonical_host=None):
+        self.path = path
+        self.fast_path = fast_path
+        self.templates = templates or {}
+        self.protocols = protocols
+        self.canonical_host = canonical_host
+        self._regex = _LazyPattern(_PROFILE_URL.format(path))
+
+    def match(self, url):
+        return self._regex.match(url)
+
+    def __reduce__(self):
+        return HostProfile, (self.path, self.fast_path, self.templates,
+                             self.protocols, self.canonical_host)
+
+    def __repr__(self):
+        return ('HostProfile({!r}, fast_path={!r}, templates={!r}, '
+                'protocols={!r}, canonical_host={!r})').format(
+                    self.path, self.fast_path, self.templates, self.protocols,
+                    self.canonical_host)
+
+
+# GitLab groups can hold subgroups, which are all part of the owner.
+GITLAB = HostProfile(
+    r'(?:(?P<owner>[\w.-]+(?:/[\w.-]+)*)/)?'
+    r'(?P<name>[\w.-]+?)(?:\.git)?',
+    fast_path=True)
+# Azure DevOps paths are `org/project/_git/repo`, or `v3/org/project/repo`
+# over SSH, and the owner is `org/project`.
+AZURE_DEVOPS = HostProfile(
+    r'(?:v3/)?(?P<owner>[\w.%-]+/[\w.%-]+)/(?:_git/)?'
+    r'(?P<name>[\w.%-]+?)(?:\.git)?',
+    fast_path=True,
+    templates={
+        'https': 'https://{user}dev.azure.com/{owner}/_git/{name}',
+        'ssh': '{user}ssh.dev.azure.com:v3/{owner}/{name}',
+    },
+    protocols=('https', 'ssh'),
+    canonical_host='dev.azure.com')
+# Bitbucket Server paths are `project/repo`, under `scm/` over HTTP, and the
+# owner of a personal repository starts with '~'.
+BITBUCKET_SERVER = HostProfile(
+    r'(?:scm/)?(?P<owner>~?[\w.-]+)/'
+    r'(?P<name>[\w.-]+?)(?:\.git)?',
+    fast_path=True,
+    templates={
+        'https': 'https://{user}{resource}{port}/scm/{path}.git',
+        'http': 'http://{user}{resource}{port}/scm/{path}.git',
+    })
+
+# The profile of each host which has one, by resource.
+_PROFILES = {
+    'gitlab.com': GITLAB,
+    'dev.azure.com': AZURE_DEVOPS,
+    'ssh.dev.azure.com': AZURE_DEVOPS,
+}
+
+# Characters allowed by the patterns above in a resource, and in an owner or
+# name, limited to ASCII.  Anything else is left to the patterns.
+_RESOURCE_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789_.-')
+_OWNER_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz'
+                         'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-')
+_NAME_CHARS = _OWNER_CHARS | frozenset('.')
+_DIGITS = frozenset('0123456789')
+
+# `CompactParsed` shares one string per known protocol.
+_PROTOCOLS = {
+    protocol: protocol
+    for protocol in ('http', 'https', 'git', 'ssh', 'rsync')
+}
+
+# The clone URL of a repository over each protocol, for `Parsed.format`,
+# unless the profile of its host has its own.  `path` is the owner and name,
+# or the name alone.
+_TEMPLATES = {
+    'https': 'https://{user}{resource}{port}/{path}.git',
+    'http': 'http://{user}{resource}{port}/{path}.git',
+    'git': 'git://{resource}{port}/{path}.git',
+    'ssh': '{user}{resource}:{path}.git',
+}
+# An SCP-like URL can't have a port.
+_SSH_PORT_TEMPLATE = 'ssh://{user}{resource}{port}/{path}.git'
+_DEFAULT_USERS = {'ssh': 'git'}
+
+# The `protocols` of the common schemes, shared between results.
+_SCHEMES = {
+    scheme: tuple(scheme.split('+'))
+    for scheme in ('http', 'https', 'git', 'ssh', 'rsync', 'git+ssh',
+                   'git+https', 'git+http', 'ssh+git')
+}
+
+# `parse_many` hands this many URLs at a time to each worker process.
+PARALLEL_CHUNK_SIZE = 4096
+
+# `parse_stream` reads files in chunks of this many bytes or characters.
+STREAM_CHUNK_SIZE = 1 << 20
+_GZIP_MAGIC = b'\x1f\x8b'
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+# Passed to the `enable_stats` callback after each URL is parsed.  `pattern`
+# is the index of the pattern in `POSSIBLE_REGEXES` which matched, or None,
+# `misses` the number of patterns tried before it, and `profile` whether the
+# profile of the host matched.
+ParseEvent = collections.namedtuple(
+    'ParseEvent',
+    ['url', 'fast_path', 'pattern', 'misses', 'seconds', 'profile'])
+
+
+class _Stats(object):
+    def __init__(self, callback):
+        self.callback = callback
+        self.fast_path = [0, 0, 0.0]
+        self.profiles = [0, 0, 0.0]
+        self.patterns = [[0, 0, 0.0] for _ in POSSIBLE_REGEXES]
+        self.errors = 0
+
+
+# The counters of `enable_stats`, and whether they're being updated.
+_stats = _Stats(None)
+_stats_enabled = False
+
 
 class ParserError(Exception):
     """ Error raised when a URL can't be parsed. """
@@ -70,45 +492,967 @@ class ParserError(Exception):
 class Parser(object):
     """
     A class responsible for parsing a GIT URL and return a `Parsed` object.
+
+    A parser created without a URL keeps only its options, and can parse any
+    number of URLs, from any number of threads, without an object per URL.
     """
 
-    def __init__(self, url):
+    def __init__(self, url=None, fast_path=True, compact=False):
         self._url = url
+        self._fast_path = fast_path
+        self._compact = compact
 
-    def parse(self):
+    def parse(self, url=None):
         """
         Parses a GIT URL and returns an object.  Raises an exception on invalid
         URL.
 
-        :returns: Parsed object
+        :param url: The GIT URL string, or None for the one the parser was
+         created with.
+        :returns: Parsed object, or CompactParsed object if the parser was
+         created with `compact=True`
         :raise: :class:`.ParserError`
         """
-        d = {
-            'pathname': None,
-            'protocols': self._get_protocols(),
-            'protocol': 'ssh',
-            'href': self._url,
-            'resource': None,
-            'user': None,
-            'port': None,
-            'name': None,
-            'owner': None,
-        }
-        for regex in POSSIBLE_REGEXES:
-            match = regex.search(self._url)
+        if url is None:
+            url = self._url
+            if url is None:
+                raise TypeError('parse() needs a URL, as the parser has none')
+        parsed = _parse(url, self._fast_path)
+        if parsed is None:
+            raise _error(url)
+        if self._compact:
+            return CompactParsed(parsed)
+
+        return parsed
+
+    def try_parse(self, url):
+        """
+        Like :meth:`.parse`, but returns None for an invalid URL instead of
+        raising.
+
+        :returns: Parsed object, CompactParsed object or None
+        """
+        parsed = _parse(url, self._fast_path)
+        if parsed is not None and self._compact:
+            return CompactParsed(parsed)
+
+        return parsed
+
+    def parse_many(self, urls):
+        """
+        Parses an iterable of GIT URLs with the options of the parser, as
+        :func:`.parse_many` does.
+
+        :returns: list
+        """
+        return parse_many(urls, self._fast_path, self._compact)
+
+    def _get_protocols(self):
+        return _get_protocols(self._url)
+
+
+def try_parse(url, fast_path=True):
+    """
+    Parses a GIT URL like :meth:`.Parser.parse`, but returns None for an
+    invalid URL instead of raising, which is cheaper when many are invalid.
+
+    :param url: A GIT URL string.
+    :param fast_path: Parse common URL shapes without regular expressions.
+    :returns: Parsed object or None
+    """
+    return _parse(url, fast_path)
+
+
+def rewrite_many(urls, protocol, user=None, port=None, fast_path=True):
+    """
+    Rewrites an iterable of GIT URLs as clone URLs over `protocol`, as
+    :meth:`.Parsed.format` does, and returns a list of them in the same
+    order.  Each URL is parsed once, and an invalid one, or one which can't
+    be formatted, has its exception placed in the list instead.
+
+    :param urls: An iterable of GIT URL strings.
+    :param protocol: One of 'https', 'http', 'git' or 'ssh'.
+    :param user: The user to put in the URLs, as for :meth:`.Parsed.format`.
+    :param port: The port to put in the URLs, or None.
+    :param fast_path: Parse common URL shapes without regular expressions.
+    :returns: list
+    :raise: ValueError if the protocol is unknown
+    """
+    _template(protocol)
+    results = []
+    append = results.append
+    for url in urls:
+        parsed = _parse(url, fast_path)
+        if parsed is None:
+            append(_error(url))
+            continue
+        try:
+            append(
+                _format(parsed.resource, parsed.owner, parsed.name, protocol,
+                        user, port))
+        except ValueError as e:
+            append(e)
+
+    return results
+
+
+def precompile():
+    """
+    Compiles the patterns that are otherwise compiled on first use, for
+    long-running processes that prefer predictable latency.
+
+    :returns: None
+    """
+    for regex in POSSIBLE_REGEXES + _BYTES_REGEXES + (_URL_IN_TEXT, ):
+        if isinstance(regex, _LazyPattern):
+            regex.compile()
+    for profile in _PROFILES.values():
+        profile._regex.compile()
+
+
+def register_host(resource, profile):
+    """
+    Parses URLs on the host `resource` with `profile` from now on, such as a
+    self-hosted GitLab with :data:`GITLAB`, or Bitbucket Server with
+    :data:`BITBUCKET_SERVER`.  gitlab.com and Azure DevOps are registered
+    already.  The profile is found by the resource of a URL in a dict, so
+    registering more hosts doesn't slow parsing down.
+
+    :param resource: A host name, in lowercase.
+    :param profile: A `HostProfile` object.
+    :returns: None
+    """
+    _PROFILES[resource] = profile
+
+
+def unregister_host(resource):
+    """
+    Parses URLs on the host `resource` with `POSSIBLE_REGEXES` again.
+
+    :param resource: A host name.
+    :returns: None
+    :raise: KeyError if the host isn't registered
+    """
+    del _PROFILES[resource]
+
+
+def parse_many(urls,
+               fast_path=True,
+               compact=False,
+               workers=1,
+               chunk_size=PARALLEL_CHUNK_SIZE,
+               adaptive=False,
+               intern=False,
+               columnar=False,
+               dictionary=()):
+    """
+    Parses an iterable of GIT URLs and returns a list of results in the same
+    order.  Unlike :meth:`.Parser.parse`, an invalid URL does not raise;
+    its :class:`.ParserError` is placed in the list instead of a `Parsed`
+    object.
+
+    With more than one worker, the URLs are parsed in a pool of processes,
+    `chunk_size` URLs at a time.
+
+    :param urls: An iterable of GIT URL strings.
+    :param fast_path: Parse common URL shapes without regular expressions.
+    :param compact: Return `CompactParsed` objects instead of `Parsed` ones.
+    :param workers: The number of processes to parse in, or None for one per
+     CPU.
+    :param chunk_size: The number of URLs sent to a process at a time.
+    :param adaptive: Stop trying the fast path while it keeps failing.
+    :param intern: Share one copy of each resource, user, protocol, owner and
+     protocols tuple between the `Parsed` objects returned, which must then
+     not be mutated.  Either True, or a dict to keep the copies in, which can
+     be passed again to share them between calls.  It has no effect with
+     `compact`, whose results keep slices of the URL rather than copies, or
+     with `columnar`, where `dictionary` is the way to share values.
+    :param columnar: Return a `ParsedColumns` object with a column per field,
+     instead of a list.
+    :param dictionary: The fields to dictionary-encode in the columns.
+    :returns: list, or ParsedColumns object
+    """
+    parse = _AdaptiveParse() if adaptive else _parse
+    if columnar:
+        return _parse_columnar(urls, parse, fast_path, workers, chunk_size,
+                               dictionary)
+    if workers != 1:
+        results = _parse_many_parallel(urls, parse, fast_path, compact,
+                                       workers, chunk_size)
+    else:
+        results = []
+        append = results.append
+        for url in urls:
+            parsed = parse(url, fast_path)
+            if parsed is None:
+                append(_error(url))
+            elif compact:
+                append(CompactParsed(parsed))
+            else:
+                append(parsed)
+
+    if intern is not False and not compact:
+        _intern_all(results, {} if intern is True else intern)
+
+    return results
+
+
+def _parse_columnar(urls, parse, fast_path, workers, chunk_size, dictionary):
+    unknown = set(dictionary) - set(Parsed._fields)
+    if unknown:
+        msg = 'Unknown fields: {}'.format(', '.join(sorted(unknown)))
+        raise ValueError(msg)
+
+    columns = collections.OrderedDict(
+        (field, _DictionaryColumn() if field in dictionary else [])
+        for field in Parsed._fields)
+    valid = array.array('B')
+    # Rows are only kept a chunk at a time, and transposed into the columns.
+    for rows in _row_chunks(urls, parse, fast_path, workers, chunk_size):
+        valid.extend([row is not _INVALID_ROW for row in rows])
+        for column, values in zip(columns.values(), zip(*rows)):
+            column.extend(values)
+
+    dictionaries = {}
+    for field in dictionary:
+        column = columns[field]
+        columns[field] = column.codes
+        dictionaries[field] = column.values
+
+    return ParsedColumns(columns, valid, dictionaries)
+
+
+_INVALID_ROW = (None, ) * len(Parsed._fields)
+
+
+def _row_chunks(urls, parse, fast_path, workers, chunk_size):
+    # Yields lists of results, with `_INVALID_ROW` for invalid URLs.
+    if workers != 1:
+        chunks = ((None, chunk) for chunk in _chunks(urls, chunk_size))
+        for _, results in _parse_parallel(chunks, parse, fast_path, False,
+                                          workers):
+            yield [
+                _INVALID_ROW if isinstance(result, ParserError) else result
+                for result in results
+            ]
+        return
+
+    for chunk in _chunks(urls, chunk_size):
+        rows = []
+        append = rows.append
+        for url in chunk:
+            parsed = parse(url, fast_path)
+            append(_INVALID_ROW if parsed is None else parsed)
+        yield rows
+
+
+class _DictionaryColumn(object):
+    def __init__(self):
+        self.codes = array.array('i')
+        self.values = []
+        self._index = {}
+
+    def extend(self, values):
+        index = self._index
+        codes = []
+        for value in values:
+            code = index.get(value)
+            if code is None:
+                if value is None:
+                    code = -1
+                else:
+                    code = index[value] = len(self.values)
+                    self.values.append(value)
+            codes.append(code)
+        self.codes.extend(codes)
+
+
+def _intern_all(results, table):
+    setdefault = table.setdefault
+    for index, result in enumerate(results):
+        if isinstance(result, ParserError):
+            continue
+        results[index] = Parsed(
+            result.pathname,
+            setdefault(result.protocols, result.protocols),
+            setdefault(result.protocol, result.protocol),
+            result.href,
+            setdefault(result.resource, result.resource),
+            setdefault(result.user, result.user),
+            result.port,
+            result.name,
+            setdefault(result.owner, result.owner),
+        )
+
+
+def _parse_many_parallel(urls, parse, fast_path, compact, workers, chunk_size):
+    chunks = ((None, chunk) for chunk in _chunks(urls, chunk_size))
+    results = []
+    for _, chunk_results in _parse_parallel(chunks, parse, fast_path, compact,
+                                            workers):
+        results.extend(chunk_results)
+
+    return results
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+
+    return iter(lambda: list(itertools.islice(iterator, size)), [])
+
+
+def _parse_parallel(chunks, parse, fast_path, compact, workers):
+    # Parses (key, URLs) chunks in a pool of processes, and yields the key and
+    # results of each chunk in order.  Only a few chunks per worker are sent
+    # ahead, so they can come from a stream of any length, and results are
+    # unpacked while the workers carry on with later chunks.
+    pool = multiprocessing.Pool(workers, _init_worker, (_PROFILES, ))
+    ahead = 2 * (workers or multiprocessing.cpu_count())
+    pending = collections.deque()
+    try:
+        for key, urls in chunks:
+            result = pool.apply_async(_parse_chunk,
+                                      ((urls, parse, fast_path, compact), ))
+            pending.append((key, urls, result))
+            if len(pending) > ahead:
+                yield _unpack_chunk(pending.popleft(), compact)
+        while pending:
+            yield _unpack_chunk(pending.popleft(), compact)
+    finally:
+        pool.terminate()
+
+
+def _unpack_chunk(pending, compact):
+    key, urls, result = pending
+    results = []
+    append = results.append
+    for url, fields in zip(urls, result.get()):
+        if fields is None:
+            append(_error(url))
+        elif compact:
+            append(CompactParsed._from_spans(url, *fields))
+        else:
+            append(
+                Parsed(fields[0], _get_protocols(url), fields[1], url,
+                       *fields[2:]))
+
+    return key, results
+
+
+def _init_worker(profiles):
+    # Processes which aren't forked start with the default profiles.
+    global _PROFILES
+    _PROFILES = profiles
+
+
+def _parse_chunk(args):
+    # Runs in a worker process.  Rather than pickling a result object per
+    # URL, it sends back plain tuples without the fields the caller can
+    # derive from the URL it already has, or the protocol and packed offsets
+    # of a `CompactParsed`.  Invalid URLs give None.
+    urls, parse, fast_path, compact = args
+    results = []
+    append = results.append
+    for url in urls:
+        parsed = parse(url, fast_path)
+        if parsed is None:
+            append(None)
+        elif compact:
+            result = CompactParsed(parsed)
+            append((result.protocol, result._spans))
+        else:
+            append((parsed.pathname, parsed.protocol) + parsed[4:])
+
+    return results
+
+
+def parse_stream(fileobj,
+                 fast_path=True,
+                 compact=False,
+                 chunk_size=STREAM_CHUNK_SIZE,
+                 workers=1,
+                 adaptive=False):
+    """
+    Parses a file with one GIT URL per line, reading it in chunks rather than
+    line by line, and yields a (line number, result) pair for each non-blank
+    line, counting lines from 1.  As with :func:`.parse_many`, an invalid URL
+    gives its :class:`.ParserError` as the result.  Files opened in binary
+    mode are decoded as UTF-8, and decompressed first if they are gzipped.
+
+    With more than one worker, the lines are parsed in a pool of processes,
+    `PARALLEL_CHUNK_SIZE` at a time.
+
+    :param fileobj: A file object opened in text or binary mode.
+    :param fast_path: Parse common URL shapes without regular expressions.
+    :param compact: Return `CompactParsed` objects instead of `Parsed` ones.
+    :param chunk_size: The size of each read from `fileobj`.
+    :param workers: The number of processes to parse in, or None for one per
+     CPU.
+    :param adaptive: Stop trying the fast path while it keeps failing.
+    :returns: generator
+    """
+    parse = _AdaptiveParse() if adaptive else _parse
+    lines = _read_lines(fileobj, chunk_size)
+    if workers == 1:
+        for lineno, url in lines:
+            yield lineno, _parse_line(parse, url, fast_path, compact)
+        return
+
+    chunks = (zip(*chunk) for chunk in _chunks(lines, PARALLEL_CHUNK_SIZE))
+    for linenos, results in _parse_parallel(chunks, parse, fast_path, compact,
+                                            workers):
+        for item in zip(linenos, results):
+            yield item
+
+
+def parse_spans(buf, start=0, end=None):
+    """
+    Parses the GIT URL in `buf[start:end]`, where `buf` is a `bytes`,
+    `bytearray` or `memoryview`, without copying or decoding it.  Each field
+    of the result is the (start, end) offsets of its value in `buf`, or None
+    when the URL doesn't have it.  `protocols` is the span of the whole
+    '+'-separated scheme, and `protocol` is None for URLs without a scheme,
+    which :meth:`.Parser.parse` reports as 'ssh'.  Host profiles aren't
+    used, only `POSSIBLE_REGEXES`.
+
+    :param buf: A bytes-like object.
+    :param start: The offset of the URL in `buf`.
+    :param end: The offset just past the URL in `buf`, or None for its end.
+    :returns: ParsedSpans object
+    :raise: :class:`.ParserError`
+    """
+    view = memoryview(buf)[start:end]
+    for regex in _BYTES_REGEXES:
+        match = regex.search(view)
+        if match:
+            break
+    else:
+        raise _error(bytes(view).decode('utf-8', 'replace'))
+
+    def span(group):
+        group_start, group_end = match.span(group)
+        if group_start == -1:
+            return None
+
+        return (start + group_start, start + group_end)
+
+    groups = match.re.groupindex
+    separator = _BYTES_SEPARATOR.search(view)
+    protocols = None
+    if separator:
+        protocols = (start, start + separator.start())
+
+    return ParsedSpans(
+        pathname=span('pathname'),
+        protocols=protocols,
+        protocol=span('protocol') if 'protocol' in groups else None,
+        href=(start, start + len(view)),
+        resource=span('resource'),
+        user=span('user'),
+        port=span('port') if 'port' in groups else None,
+        name=span('name'),
+        owner=span('owner'),
+    )
+
+
+def finditer(text, fast_path=True):
+    """
+    Finds the GIT URLs in `text`, such as a `.gitmodules` or `package.json`
+    file or a log, in one pass over it.  Only URLs with a scheme, such as
+    'https://host/owner/name', and SCP-like ones, such as
+    'git@host:owner/name.git' or 'host:owner/name.git', are looked for, and
+    each is parsed like :meth:`.Parser.parse`.  Punctuation ending a sentence
+    is left out of a URL, and so is anything from a '#', '?' or, in the path,
+    '@' on, such as a pip '@tag#egg=name' suffix.
+
+    :param text: A string.
+    :param fast_path: Parse common URL shapes without regular expressions.
+    :returns: iterator of (start, end, Parsed object) tuples, with the offsets
+     of each URL in `text`
+    """
+    for match in _URL_IN_TEXT.finditer(text):
+        start = match.start()
+        url = match.group().rstrip(_URL_TRAILER)
+        parsed = _parse(url, fast_path)
+        if parsed is not None:
+            yield start, start + len(url), parsed
+
+
+def _parse_line(parse, url, fast_path, compact):
+    parsed = parse(url, fast_path)
+    if parsed is None:
+        return _error(url)
+    if compact:
+        return CompactParsed(parsed)
+
+    return parsed
+
+
+def _read_lines(fileobj, chunk_size):
+    # Yields the line number and text of each non-blank line.
+    lineno = 0
+    rest = ''
+    for chunk in _read_text(fileobj, chunk_size):
+        lines = (rest + chunk).split('\n')
+        rest = lines.pop()
+        for line in lines:
+            lineno += 1
+            line = line.rstrip('\r')
+            if line:
+                yield lineno, line
+    rest = rest.rstrip('\r')
+    if rest:
+        yield lineno + 1, rest
+
+
+def _read_text(fileobj, chunk_size):
+    # Yields the text of `fileobj` a chunk at a time.
+    chunk = fileobj.read(chunk_size)
+    chunks = _read_chunks(fileobj, chunk_size, chunk)
+    if not isinstance(chunk, bytes):
+        for chunk in chunks:
+            yield chunk
+        return
+
+    if chunk.startswith(_GZIP_MAGIC):
+        chunks = _gunzip(chunks)
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', True)
+
+
+def _read_chunks(fileobj, chunk_size, chunk):
+    while chunk:
+        yield chunk
+        chunk = fileobj.read(chunk_size)
+
+
+def _gunzip(chunks):
+    # A gzip file may hold several members, one after the other.
+    decompressor = zlib.decompressobj(_GZIP_WBITS)
+    for chunk in chunks:
+        while chunk:
+            yield decompressor.decompress(chunk)
+            chunk = decompressor.unused_data
+            if chunk:
+                decompressor = zlib.decompressobj(_GZIP_WBITS)
+
+
+def enable_stats(callback=None):
+    """
+    Starts counting, for the fast path, host profiles and each of
+    `POSSIBLE_REGEXES`, the URLs it parses, the URLs it's tried on without
+    success and the time spent in it, along with the URLs which can't be
+    parsed.  The counters start from zero.  Only parsing in the current
+    process is counted, and counting slows it down; while disabled, it costs
+    a single check per URL.
+
+    :param callback: A function called with a `ParseEvent` after each URL is
+     parsed, or None.
+    :returns: None
+    """
+    global _stats, _stats_enabled
+    _stats = _Stats(callback)
+    _stats_enabled = True
+
+
+def disable_stats():
+    """
+    Stops counting.  The counters can still be read with :func:`.get_stats`.
+
+    :returns: None
+    """
+    global _stats_enabled
+    _stats_enabled = False
+
+
+def get_stats():
+    """
+    Returns the counters collected since :func:`.enable_stats` was last called,
+    as a dict with the 'hits', 'misses' and 'time' of the 'fast_path', the same
+    for host 'profiles' and for each of `POSSIBLE_REGEXES` in a 'patterns'
+    list, and the number of 'errors'.
+
+    :returns: dict
+    """
+    stats = _stats
+
+    return {
+        'fast_path': _counters_dict(stats.fast_path),
+        'profiles': _counters_dict(stats.profiles),
+        'patterns': [_counters_dict(counters) for counters in stats.patterns],
+        'errors': stats.errors,
+    }
+
+
+def _counters_dict(counters):
+    return dict(zip(('hits', 'misses', 'time'), counters))
+
+
+def _parse(url, fast_path):
+    if _stats_enabled:
+        return _parse_counted(url, fast_path, _stats)
+
+    # Found once, for the fast path, the dispatch to the patterns and the
+    # protocols.
+    separator = url.find('://')
+    if fast_path:
+        parsed = _fast_parse(url, separator)
+        if parsed is not None:
+            return parsed
+
+    return _parse_slow(url, separator)
+
+
+def _parse_slow(url, separator):
+    # `_parse` without the fast path.
+    match = _profile_match(url, separator)
+    if match is None:
+        match = _match(url, separator)
+        if match is None:
+            return None
+
+    return _build(url, match, separator)
+
+
+class _AdaptiveParse(object):
+    # `_parse` for a run of URLs, which stops trying the fast path when it
+    # fails on most of a window of URLs, and tries it again after a pause in
+    # case they change.  The result is the same either way, since the fast
+    # path only parses URLs the way the patterns would.  While stats are
+    # being counted, the fast path is tried or not as it was last decided.
+
+    window = 256
+    pause = 1024
+
+    def __init__(self):
+        self._fast_path = True
+        self._tried = self._hits = self._skipped = 0
+
+    def __call__(self, url, fast_path):
+        if not fast_path:
+            return _parse(url, False)
+        if not self._fast_path:
+            self._skipped += 1
+            if self._skipped == self.pause:
+                self._fast_path = True
+                self._skipped = 0
+            return _parse(url, False)
+        if _stats_enabled:
+            return _parse(url, True)
+
+        separator = url.find('://')
+        parsed = _fast_parse(url, separator)
+        self._tried += 1
+        if parsed is not None:
+            self._hits += 1
+        if self._tried == self.window:
+            self._fast_path = 2 * self._hits >= self.window
+            self._tried = self._hits = 0
+        if parsed is not None:
+            return parsed
+
+        return _parse_slow(url, separator)
+
+
+def _parse_counted(url, fast_path, stats):
+    # `_parse`, updating the counters of `enable_stats`.
+    timer = timeit.default_timer
+    began = start = timer()
+    separator = url.find('://')
+    parsed = None
+    if fast_path:
+        parsed = _fast_parse(url, separator)
+        end = timer()
+        counters = stats.fast_path
+        counters[0 if parsed is not None else 1] += 1
+        counters[2] += end - start
+        start = end
+    fast_path_hit = parsed is not None
+
+    profile_hit = False
+    if parsed is None:
+        profile = _PROFILES.get(_host(url, separator))
+        if profile is not None:
+            match = profile.match(url)
+            end = timer()
+            counters = stats.profiles
+            counters[0 if match else 1] += 1
+            counters[2] += end - start
+            start = end
+            if match:
+                parsed = _build(url, match, separator)
+                profile_hit = True
+
+    index = None
+    misses = 0
+    if parsed is None:
+        for regex in _candidates(url, separator):
+            match = regex.search(url)
+            end = timer()
+            index = POSSIBLE_REGEXES.index(regex)
+            counters = stats.patterns[index]
+            counters[2] += end - start
+            start = end
             if match:
-                d.update(match.groupdict())
+                counters[0] += 1
+                parsed = _build(url, match, separator)
                 break
+            counters[1] += 1
+            misses += 1
         else:
-            msg = "Invalid URL '{}'".format(self._url)
-            raise ParserError(msg)
+            index = None
+            stats.errors += 1
 
-        return Parsed(**d)
+    if stats.callback is not None:
+        stats.callback(
+            ParseEvent(url, fast_path_hit, index, misses,
+                       timer() - began, profile_hit))
 
-    def _get_protocols(self):
-        try:
-            index = self._url.index('://')
-        except ValueError:
-            return []
+    return parsed
+
+
+def _fast_parse(url, separator):
+    # Parses `scheme://[user@]host[:port]/[owner/]name` and
+    # `[user@]host:[/]owner/name.git` with string operations, giving the same
+    # result as the patterns would.  Returns None for any other shape.
+    # `separator` is the offset of the first '://' in `url`, or -1.
+    if '\n' in url:
+        return None
+    if separator == -1:
+        return _fast_parse_scp(url)
+    if url.startswith(_FIRST_PREFIXES):
+        return _fast_parse_url(url, separator)
+
+    return None
+
+
+def _fast_parse_url(url, separator):
+    protocol = url[:separator]
+    rest = url[separator + 3:]
+    user, at, rest = rest.rpartition('@')
+    resource, slash, path = rest.partition('/')
+    resource, colon, port = resource.partition(':')
+    if at and not user or not slash or not _is_resource(resource):
+        return None
+    if colon and not (port and _DIGITS.issuperset(port)):
+        return None
+
+    segments = path.split('/')
+    if len(segments) == 1:
+        owner = None
+        name = _strip_git(segments[0])
+    elif len(segments) == 2 and segments[1]:
+        owner, name = segments[0], _strip_git(segments[1])
+    elif len(segments) == 3 and not segments[2]:
+        owner, name = segments[:2]
+    else:
+        return None
+    if owner is not None and not _is_url_owner(owner):
+        return None
+    if not (name and _NAME_CHARS.issuperset(name)):
+        return None
+
+    return Parsed(
+        pathname=slash + path,
+        protocols=_SCHEMES[protocol],
+        protocol=protocol,
+        href=url,
+        resource=resource,
+        user=user or None,
+        port=port or None,
+        name=name,
+        owner=owner,
+    )
+
+
+def _fast_parse_scp(url):
+    user, at, rest = url.rpartition('@')
+    resource, colon, path = rest.partition(':')
+    if at and not user or not colon or not _is_resource(resource):
+        return None
+
+    owner, slash, name = path[path.startswith('/'):].partition('/')
+    if '/' in name or not name.endswith('.git'):
+        return None
+    name = name[:-4]
+    if not (owner and _OWNER_CHARS.issuperset(owner)) or owner[0] in _DIGITS:
+        return None
+    if not (name and _NAME_CHARS.issuperset(name)):
+        return None
+
+    return Parsed(
+        pathname=path,
+        protocols=(),
+        protocol='ssh',
+        href=url,
+        resource=resource,
+        user=user or None,
+        port=None,
+        name=name,
+        owner=owner,
+    )
+
+
+def _is_resource(resource):
+    # URLs on hosts with a profile are left to it, unless it agrees with the
+    # fast path.
+    if not (resource and _RESOURCE_CHARS.issuperset(resource)):
+        return False
+    profile = _PROFILES.get(resource)
+
+    return profile is None or profile.fast_path
+
+
+def _is_url_owner(owner):
+    # An all-digit owner is taken for a port by the first pattern.
+    return (owner and _OWNER_CHARS.issuperset(owner)
+            and not _DIGITS.issuperset(owner))
+
+
+def _strip_git(name):
+    if len(name) > 4 and name.endswith('.git'):
+        return name[:-4]
+
+    return name
+
+
+def _profile_match(url, separator):
+    profile = _PROFILES.get(_host(url, separator))
+    if profile is None:
+        return None
+
+    return profile.match(url)
+
+
+def _host(url, separator):
+    # The resource of `url`, as a profile would find it, found without one.
+    # `separator` is the offset of the first '://' in it, or -1.
+    head = url[separator + 3:] if separator != -1 else url
+    head = head.partition('/')[0]
+
+    return head.rpartition('@')[2].partition(':')[0]
+
+
+def _match(url, separator):
+    for regex in _candidates(url, separator):
+        match = regex.search(url)
+        if match:
+            return match
+
+    return None
+
+
+def _candidates(url, separator):
+    if not _may_match(url):
+        return ()
+    if separator == -1:
+        first = 2
+    elif url.startswith(_FIRST_PREFIXES):
+        first = 0
+    else:
+        first = 1
+    third = url.endswith(_THIRD_SUFFIXES) and '/' in url
+
+    return _CANDIDATES[first, third]
+
+
+def _may_match(url):
+    # Whether any of the patterns could match, checked in linear time without
+    # them.  Apart from the user of the first and third patterns and the
+    # owner and name of the third, nothing they match can hold whitespace,
+    # and every match runs to the end of the URL.  So unless the third can
+    # match, the last word of the URL must hold the ':' or '/' the patterns
+    # all need.  The third needs a '/' and a URL ending in 'git'.
+    if url.endswith(_THIRD_SUFFIXES) and '/' in url:
+        return True
+    words = url.rsplit(None, 1)
+
+    return bool(words) and (':' in words[-1] or '/' in words[-1])
+
+
+def _build(url, match, separator):
+    d = match.groupdict()
+
+    return Parsed(
+        pathname=d['pathname'],
+        protocols=_protocols(url, separator),
+        protocol=d.get('protocol') or 'ssh',
+        href=url,
+        resource=d['resource'],
+        user=d['user'],
+        port=d.get('port'),
+        name=d['name'],
+        owner=d['owner'],
+    )
+
+
+def _canonical_key(resource, owner, name):
+    resource = resource.lower()
+    profile = _PROFILES.get(resource)
+    if profile is not None and profile.canonical_host is not None:
+        resource = profile.canonical_host
+    if name is not None:
+        name = _strip_git(name.lower())
+
+    return RepoKey(resource, owner and owner.lower(), name)
+
+
+def _format(resource, owner, name, protocol, user, port):
+    template = _template(protocol)
+    if name is None:
+        raise ValueError("Can't format a URL without a name")
+    if user is None:
+        user = _DEFAULT_USERS.get(protocol)
+    profile = _PROFILES.get(resource)
+    protocols = profile and profile.protocols
+    if protocols is not None and protocol not in protocols:
+        msg = "'{}' isn't served over '{}'".format(resource, protocol)
+        raise ValueError(msg)
+    if profile is not None and protocol in profile.templates:
+        template = profile.templates[protocol]
+        if owner is None and '{owner}' in template:
+            msg = "Can't format a URL on '{}' without an owner".format(
+                resource)
+            raise ValueError(msg)
+    elif protocol == 'ssh' and port is not None:
+        template = _SSH_PORT_TEMPLATE
+
+    return template.format(
+        user=user + '@' if user else '',
+        resource=resource,
+        port='' if port is None else ':{}'.format(port),
+        path=name if owner is None else owner + '/' + name,
+        owner=owner,
+        name=name,
+    )
+
+
+def _template(protocol):
+    template = _TEMPLATES.get(protocol)
+    if template is None:
+        raise ValueError("Unknown protocol '{}'".format(protocol))
+
+    return template
+
+
+def _error(url):
+    msg = "Invalid URL '{}'".format(url)
+
+    return ParserError(msg)
+
+
+def _get_protocols(url):
+    return _protocols(url, url.find('://'))
+
+
+def _protocols(url, separator):
+    if separator == -1:
+        return ()
+    scheme = url[:separator]
+    protocols = _SCHEMES.get(scheme)
+    if protocols is None:
+        protocols = tuple(scheme.split('+'))
 
-        return self._url[:index].split('+')
+    return protocols
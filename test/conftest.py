@@ -20,15 +20,20 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import sys
+
 import pytest
 
+# Async generators don't even compile before Python 3.6.
+collect_ignore = ['test_aio.py'] if sys.version_info < (3, 6) else []
+
 
 @pytest.fixture()
 def first_match_urls():
     return {
         'http://example.com/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['http'],
+            'protocols': ('http', ),
             'protocol': 'http',
             'href': 'http://example.com/owner/repo.git',
             'resource': 'example.com',
@@ -39,7 +44,7 @@ def first_match_urls():
         },
         'http://example.com/owner/repo': {
             'pathname': '/owner/repo',
-            'protocols': ['http'],
+            'protocols': ('http', ),
             'protocol': 'http',
             'href': 'http://example.com/owner/repo',
             'resource': 'example.com',
@@ -50,7 +55,7 @@ def first_match_urls():
         },
         'http://example.com/owner/repo/': {
             'pathname': '/owner/repo/',
-            'protocols': ['http'],
+            'protocols': ('http', ),
             'protocol': 'http',
             'href': 'http://example.com/owner/repo/',
             'resource': 'example.com',
@@ -61,7 +66,7 @@ def first_match_urls():
         },
         'http://user@example.com/user/repo': {
             'pathname': '/user/repo',
-            'protocols': ['http'],
+            'protocols': ('http', ),
             'protocol': 'http',
             'href': 'http://user@example.com/user/repo',
             'resource': 'example.com',
@@ -72,7 +77,7 @@ def first_match_urls():
         },
         'http://example.com:29418/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['http'],
+            'protocols': ('http', ),
             'protocol': 'http',
             'href': 'http://example.com:29418/owner/repo.git',
             'resource': 'example.com',
@@ -83,7 +88,7 @@ def first_match_urls():
         },
         'http://user@example.com:29418/user/repo': {
             'pathname': '/user/repo',
-            'protocols': ['http'],
+            'protocols': ('http', ),
             'protocol': 'http',
             'href': 'http://user@example.com:29418/user/repo',
             'resource': 'example.com',
@@ -94,7 +99,7 @@ def first_match_urls():
         },
         'http://user@example.com:29418/user/repo/': {
             'pathname': '/user/repo/',
-            'protocols': ['http'],
+            'protocols': ('http', ),
             'protocol': 'http',
             'href': 'http://user@example.com:29418/user/repo/',
             'resource': 'example.com',
@@ -105,7 +110,7 @@ def first_match_urls():
         },
         'http://example.com/repo': {
             'pathname': '/repo',
-            'protocols': ['http'],
+            'protocols': ('http', ),
             'protocol': 'http',
             'href': 'http://example.com/repo',
             'resource': 'example.com',
@@ -116,7 +121,7 @@ def first_match_urls():
         },
         'https://example.com/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['https'],
+            'protocols': ('https', ),
             'protocol': 'https',
             'href': 'https://example.com/owner/repo.git',
             'resource': 'example.com',
@@ -127,7 +132,7 @@ def first_match_urls():
         },
         'https://example.com/owner/repo': {
             'pathname': '/owner/repo',
-            'protocols': ['https'],
+            'protocols': ('https', ),
             'protocol': 'https',
             'href': 'https://example.com/owner/repo',
             'resource': 'example.com',
@@ -138,7 +143,7 @@ def first_match_urls():
         },
         'https://user@example.com/user/repo': {
             'pathname': '/user/repo',
-            'protocols': ['https'],
+            'protocols': ('https', ),
             'protocol': 'https',
             'href': 'https://user@example.com/user/repo',
             'resource': 'example.com',
@@ -149,7 +154,7 @@ def first_match_urls():
         },
         'https://example.com:29418/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['https'],
+            'protocols': ('https', ),
             'protocol': 'https',
             'href': 'https://example.com:29418/owner/repo.git',
             'resource': 'example.com',
@@ -160,7 +165,7 @@ def first_match_urls():
         },
         'https://user@example.com:29418/user/repo': {
             'pathname': '/user/repo',
-            'protocols': ['https'],
+            'protocols': ('https', ),
             'protocol': 'https',
             'href': 'https://user@example.com:29418/user/repo',
             'resource': 'example.com',
@@ -171,7 +176,7 @@ def first_match_urls():
         },
         'https://example.com/repo': {
             'pathname': '/repo',
-            'protocols': ['https'],
+            'protocols': ('https', ),
             'protocol': 'https',
             'href': 'https://example.com/repo',
             'resource': 'example.com',
@@ -182,7 +187,7 @@ def first_match_urls():
         },
         'rsync://example.com/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['rsync'],
+            'protocols': ('rsync', ),
             'protocol': 'rsync',
             'href': 'rsync://example.com/owner/repo.git',
             'resource': 'example.com',
@@ -193,7 +198,7 @@ def first_match_urls():
         },
         'git://example.com/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['git'],
+            'protocols': ('git', ),
             'protocol': 'git',
             'href': 'git://example.com/owner/repo.git',
             'resource': 'example.com',
@@ -204,7 +209,7 @@ def first_match_urls():
         },
         'git://example.com/owner/repo': {
             'pathname': '/owner/repo',
-            'protocols': ['git'],
+            'protocols': ('git', ),
             'protocol': 'git',
             'href': 'git://example.com/owner/repo',
             'resource': 'example.com',
@@ -215,7 +220,7 @@ def first_match_urls():
         },
         'git://example.com/owner/repo/': {
             'pathname': '/owner/repo/',
-            'protocols': ['git'],
+            'protocols': ('git', ),
             'protocol': 'git',
             'href': 'git://example.com/owner/repo/',
             'resource': 'example.com',
@@ -226,7 +231,7 @@ def first_match_urls():
         },
         'ssh://user@example.com/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['ssh'],
+            'protocols': ('ssh', ),
             'protocol': 'ssh',
             'href': 'ssh://user@example.com/owner/repo.git',
             'resource': 'example.com',
@@ -237,7 +242,7 @@ def first_match_urls():
         },
         'ssh://user@example.com:29418/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['ssh'],
+            'protocols': ('ssh', ),
             'protocol': 'ssh',
             'href': 'ssh://user@example.com:29418/owner/repo.git',
             'resource': 'example.com',
@@ -248,7 +253,7 @@ def first_match_urls():
         },
         'ssh://example.com/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['ssh'],
+            'protocols': ('ssh', ),
             'protocol': 'ssh',
             'href': 'ssh://example.com/owner/repo.git',
             'resource': 'example.com',
@@ -259,7 +264,7 @@ def first_match_urls():
         },
         'ssh://example.com:29418/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['ssh'],
+            'protocols': ('ssh', ),
             'protocol': 'ssh',
             'href': 'ssh://example.com:29418/owner/repo.git',
             'resource': 'example.com',
@@ -271,7 +276,7 @@ def first_match_urls():
         # https://github.com/retr0h/git-url-parse/issues/29
         'https://github.com/sphinx-doc/sphinx.git': {
             'pathname': '/sphinx-doc/sphinx.git',
-            'protocols': ['https'],
+            'protocols': ('https', ),
             'protocol': 'https',
             'href': 'https://github.com/sphinx-doc/sphinx.git',
             'resource': 'github.com',
@@ -283,7 +288,7 @@ def first_match_urls():
         # https://github.com/retr0h/git-url-parse/issues/33
         'https://github.com/tterranigma/Stouts.openvpn': {
             'pathname': '/tterranigma/Stouts.openvpn',
-            'protocols': ['https'],
+            'protocols': ('https', ),
             'protocol': 'https',
             'href': 'https://github.com/tterranigma/Stouts.openvpn',
             'resource': 'github.com',
@@ -294,7 +299,7 @@ def first_match_urls():
         },
         'https://github.com/tterranigma/Stouts.openvpn/': {
             'pathname': '/tterranigma/Stouts.openvpn/',
-            'protocols': ['https'],
+            'protocols': ('https', ),
             'protocol': 'https',
             'href': 'https://github.com/tterranigma/Stouts.openvpn/',
             'resource': 'github.com',
@@ -306,7 +311,7 @@ def first_match_urls():
         # https://github.com/retr0h/git-url-parse/issues/33
         'https://github.com/tterranigma/Stouts.openvpn.git': {
             'pathname': '/tterranigma/Stouts.openvpn.git',
-            'protocols': ['https'],
+            'protocols': ('https', ),
             'protocol': 'https',
             'href': 'https://github.com/tterranigma/Stouts.openvpn.git',
             'resource': 'github.com',
@@ -323,7 +328,7 @@ def second_match_urls():
     return {
         'git+ssh://example.com/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['git', 'ssh'],
+            'protocols': ('git', 'ssh'),
             'protocol': 'ssh',
             'href': 'git+ssh://example.com/owner/repo.git',
             'resource': 'example.com',
@@ -334,7 +339,7 @@ def second_match_urls():
         },
         'git+ssh://example.com:9999/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['git', 'ssh'],
+            'protocols': ('git', 'ssh'),
             'protocol': 'ssh',
             'href': 'git+ssh://example.com:9999/owner/repo.git',
             'resource': 'example.com',
@@ -345,7 +350,7 @@ def second_match_urls():
         },
         'git+https://example.com/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['git', 'https'],
+            'protocols': ('git', 'https'),
             'protocol': 'https',
             'href': 'git+https://example.com/owner/repo.git',
             'resource': 'example.com',
@@ -356,7 +361,7 @@ def second_match_urls():
         },
         'git+https://example.com:9999/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': ['git', 'https'],
+            'protocols': ('git', 'https'),
             'protocol': 'https',
             'href': 'git+https://example.com:9999/owner/repo.git',
             'resource': 'example.com',
@@ -373,7 +378,7 @@ def third_match_urls():
     return {
         'user@example.com:/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': [],
+            'protocols': (),
             'protocol': 'ssh',
             'href': 'user@example.com:/owner/repo.git',
             'resource': 'example.com',
@@ -384,7 +389,7 @@ def third_match_urls():
         },
         'user@example.com:owner/repo.git': {
             'pathname': 'owner/repo.git',
-            'protocols': [],
+            'protocols': (),
             'protocol': 'ssh',
             'href': 'user@example.com:owner/repo.git',
             'resource': 'example.com',
@@ -395,7 +400,7 @@ def third_match_urls():
         },
         'user@foo-example.com:owner/repo.git': {
             'pathname': 'owner/repo.git',
-            'protocols': [],
+            'protocols': (),
             'protocol': 'ssh',
             'href': 'user@foo-example.com:owner/repo.git',
             'resource': 'foo-example.com',
@@ -407,7 +412,7 @@ def third_match_urls():
         # GitLab
         'user@foo-example.com:9999/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': [],
+            'protocols': (),
             'protocol': 'ssh',
             'href': 'user@foo-example.com:9999/owner/repo.git',
             'resource': 'foo-example.com',
@@ -425,7 +430,7 @@ def fourth_match_urls():
         # NOTE(retr0h): This should really be handled by regexp group 3
         'user@example.com:repo.git': {
             'pathname': 'repo.git',
-            'protocols': [],
+            'protocols': (),
             'protocol': 'ssh',
             'href': 'user@example.com:repo.git',
             'resource': 'example.com',
@@ -436,7 +441,7 @@ def fourth_match_urls():
         },
         'example.com:/owner/repo.git': {
             'pathname': '/owner/repo.git',
-            'protocols': [],
+            'protocols': (),
             'protocol': 'ssh',
             'href': 'example.com:/owner/repo.git',
             'resource': 'example.com',
@@ -447,7 +452,7 @@ def fourth_match_urls():
         },
         'example.com:owner/repo.git': {
             'pathname': 'owner/repo.git',
-            'protocols': [],
+            'protocols': (),
             'protocol': 'ssh',
             'href': 'example.com:owner/repo.git',
             'resource': 'example.com',
@@ -458,7 +463,7 @@ def fourth_match_urls():
         },
         'example.com:repo.git': {
             'pathname': 'repo.git',
-            'protocols': [],
+            'protocols': (),
             'protocol': 'ssh',
             'href': 'example.com:repo.git',
             'resource': 'example.com',
@@ -473,3 +478,34 @@ def fourth_match_urls():
 @pytest.fixture()
 def invalid_strings():
     return ['', 'not a valid URL']
+
+
+@pytest.fixture()
+def fast_path_declined_urls():
+    return [
+        'https://github.com/owner/repo\n',
+        'git+ssh://example.com/owner/repo.git',
+        'https://@example.com/owner/repo',
+        'https://example.com',
+        'https://Example.com/owner/repo',
+        'https://example.com:/owner/repo',
+        'https://example.com:a/owner/repo',
+        'https://example.com/owner/repo/x',
+        'https://example.com/repo/',
+        'https://example.com/own.er/repo',
+        'https://example.com/9999/repo',
+        'https://example.com/owner/',
+        'https://example.com/owner/re@po',
+        'https://example.com/owner/re+po',
+        '@example.com:owner/repo.git',
+        'example.com/owner/repo.git',
+        'Example.com:owner/repo.git',
+        'example.com:owner/sub/repo.git',
+        'example.com:owner/repo',
+        'example.com:9999/repo.git',
+        'example.com::owner/repo.git',
+        'example.com://owner/repo.git',
+        'example.com:ow.ner/repo.git',
+        'example.com:owner/.git',
+        'example.com:owner/re@po.git',
+    ]
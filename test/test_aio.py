@@ -0,0 +1,119 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import concurrent.futures
+
+import pytest
+
+from giturlparse import aio
+from giturlparse import parser
+
+URLS = [
+    'https://github.com/owner/repo.git',
+    'not a url',
+    'git@github.com:owner/repo.git',
+    'example.com:repo.git',
+]
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def _results(results):
+    return [str(r) if isinstance(r, Exception) else r for r in results]
+
+
+async def _collect(iterator):
+    return [result async for result in iterator]
+
+
+async def _aiter(urls):
+    for url in urls:
+        yield url
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_aparse_many(compact):
+    results = _run(aio.aparse_many(URLS * 3, compact=compact, chunk_size=5))
+
+    assert _results(parser.parse_many(URLS * 3,
+                                      compact=compact)) == _results(results)
+
+
+def test_aparse_many_yields_to_the_loop():
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(tick())
+        results = await aio.aparse_many(URLS * 4, chunk_size=2)
+        task.cancel()
+        return results
+
+    assert 16 == len(_run(main()))
+    assert len(ticks) >= 8
+
+
+def test_aparse_many_in_executor():
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        results = _run(
+            aio.aparse_many(
+                _aiter(URLS * 3),
+                chunk_size=2,
+                executor=executor,
+                max_pending=3))
+
+    assert _results(parser.parse_many(URLS * 3)) == _results(results)
+
+
+def test_aparse_iter():
+    results = _run(_collect(aio.aparse_iter(_aiter(URLS), chunk_size=3)))
+
+    assert _results(parser.parse_many(URLS)) == _results(results)
+
+
+def test_aparse_iter_reads_ahead_at_most_max_pending_chunks():
+    read = []
+
+    async def urls():
+        for url in URLS * 5:
+            read.append(url)
+            yield url
+
+    async def first():
+        iterator = aio.aparse_iter(urls(), chunk_size=2, max_pending=2)
+        result = await iterator.__anext__()
+        await iterator.aclose()
+        return result
+
+    assert parser.Parser(URLS[0]).parse() == _run(first())
+    assert 4 == len(read)
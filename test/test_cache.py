@@ -0,0 +1,131 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import threading
+
+import pytest
+
+from giturlparse import cache
+from giturlparse import parser
+
+
+def test_parse_returns_cached_result():
+    c = cache.ParseCache()
+    first = c.parse('git@example.com:owner/repo.git')
+    second = c.parse('git@example.com:owner/repo.git')
+
+    assert first is second
+    assert parser.Parser('git@example.com:owner/repo.git').parse() == first
+    assert (1, 1, 0, cache.DEFAULT_MAXSIZE, 1) == c.cache_info()
+
+
+def test_parse_caches_errors(mocker):
+    c = cache.ParseCache()
+    with pytest.raises(parser.ParserError):
+        c.parse('not a valid URL')
+
+    spy = mocker.spy(parser, 'try_parse')
+    with pytest.raises(parser.ParserError) as e:
+        c.parse('not a valid URL')
+
+    assert "Invalid URL 'not a valid URL'" == str(e.value)
+    assert 0 == spy.call_count
+    assert 1 == c.cache_info().hits
+
+
+def test_try_parse(mocker):
+    c = cache.ParseCache()
+
+    assert c.try_parse('not a valid URL') is None
+    spy = mocker.spy(parser, 'try_parse')
+    assert c.try_parse('not a valid URL') is None
+    assert c.parse('example.com:a.git') is c.try_parse('example.com:a.git')
+    assert 1 == spy.call_count
+
+
+def test_parse_evicts_least_recently_used():
+    c = cache.ParseCache(maxsize=2)
+    a = c.parse('example.com:a.git')
+    c.parse('example.com:b.git')
+    c.parse('example.com:a.git')
+    c.parse('example.com:c.git')
+
+    assert a is c.parse('example.com:a.git')
+    assert (2, 3, 1, 2, 2) == c.cache_info()
+
+
+def test_maxsize_setter_shrinks_cache():
+    c = cache.ParseCache()
+    for url in ('example.com:a.git', 'example.com:b.git', 'example.com:c.git'):
+        c.parse(url)
+    c.maxsize = 1
+
+    assert 1 == c.maxsize
+    assert (0, 3, 2, 1, 1) == c.cache_info()
+
+
+def test_zero_maxsize_disables_cache():
+    c = cache.ParseCache(maxsize=0)
+    first = c.parse('example.com:a.git')
+
+    assert first is not c.parse('example.com:a.git')
+    assert (0, 2, 0, 0, 0) == c.cache_info()
+
+
+def test_negative_maxsize_raises():
+    with pytest.raises(ValueError) as e:
+        cache.ParseCache(maxsize=-1)
+    assert "Cache maxsize can't be negative: -1" == str(e.value)
+
+    c = cache.ParseCache()
+    with pytest.raises(ValueError):
+        c.maxsize = -1
+    assert cache.DEFAULT_MAXSIZE == c.maxsize
+
+
+def test_cache_clear():
+    c = cache.ParseCache()
+    c.parse('example.com:a.git')
+    c.parse('example.com:a.git')
+    c.cache_clear()
+
+    assert (0, 0, 0, cache.DEFAULT_MAXSIZE, 0) == c.cache_info()
+
+
+def test_parse_is_thread_safe(first_match_urls):
+    c = cache.ParseCache(maxsize=8)
+    urls = list(first_match_urls)
+
+    def worker():
+        for _ in range(20):
+            for url in urls:
+                assert url == c.parse(url).href
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    info = c.cache_info()
+    assert 4 * 20 * len(urls) == info.hits + info.misses
+    assert 8 == info.currsize
@@ -0,0 +1,114 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import gzip
+import io
+import json
+
+import pytest
+
+from giturlparse import cli
+from giturlparse import parser
+
+URLS = [
+    'git+ssh://example.com:9999/owner/repo.git',
+    'not a url',
+    'git@github.com:owner/repo.git',
+]
+
+
+@pytest.fixture()
+def urls_file(tmpdir):
+    path = tmpdir.join('urls.txt')
+    path.write('\n'.join(URLS) + '\n')
+
+    return str(path)
+
+
+def test_main_jsonl(capsys, urls_file):
+    assert 1 == cli.main([urls_file])
+
+    out, err = capsys.readouterr()
+    rows = [json.loads(line) for line in out.splitlines()]
+    # JSON turns the protocols tuple into a list.
+    expected = [
+        json.loads(json.dumps(parser.Parser(url).parse()._asdict()))
+        for url in (URLS[0], URLS[2])
+    ]
+    assert expected == rows
+    assert list(parser.Parsed._fields) == list(rows[0])
+    assert ("{}:2: Invalid URL 'not a url'\n".format(urls_file) ==
+            err.splitlines(True)[0])
+    assert err.splitlines()[1].startswith('3 URLs in ')
+    assert err.endswith(', 1 errors\n')
+
+
+@pytest.mark.parametrize('output_format, delimiter', [
+    ('csv', ','),
+    ('tsv', '\t'),
+])
+def test_main_csv(capsys, urls_file, output_format, delimiter):
+    cli.main([
+        urls_file, '--format', output_format, '--fields',
+        'protocols,user,resource,name', '--quiet'
+    ])
+
+    out, err = capsys.readouterr()
+    assert [
+        ['protocols', 'user', 'resource', 'name'],
+        ['git+ssh', '', 'example.com', 'repo'],
+        ['', 'git', 'github.com', 'repo'],
+    ] == [line.split(delimiter) for line in out.splitlines()]
+    assert "{}:2: Invalid URL 'not a url'\n".format(urls_file) == err
+
+
+def test_main_stdin_gzip(capsys, monkeypatch):
+    data = io.BytesIO()
+    with gzip.GzipFile(fileobj=data, mode='wb') as f:
+        f.write('\n'.join(URLS[:2]).encode('utf-8'))
+    stdin = io.TextIOWrapper(io.BytesIO(data.getvalue()))
+    monkeypatch.setattr('sys.stdin', stdin)
+
+    assert 1 == cli.main(['-', '--fields', 'owner', '--workers', '2', '-q'])
+
+    out, err = capsys.readouterr()
+    assert '{"owner": "owner"}\n' == out
+    assert "<stdin>:2: Invalid URL 'not a url'\n" == err
+
+
+def test_main_reports_unreadable_files(capsys, tmpdir, urls_file):
+    missing = str(tmpdir.join('missing.txt'))
+
+    assert 1 == cli.main([missing, urls_file, '--quiet'])
+
+    out, err = capsys.readouterr()
+    assert 2 == len(out.splitlines())
+    assert err.startswith('giturlparse: {}: '.format(missing))
+    assert 'No such file or directory' in err.splitlines()[0]
+
+
+def test_main_rejects_unknown_fields(capsys):
+    with pytest.raises(SystemExit):
+        cli.main(['--fields', 'owner,colour'])
+
+    _, err = capsys.readouterr()
+    assert 'unknown fields: colour' in err
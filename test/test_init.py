@@ -0,0 +1,56 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright (c) 2017 John Dewey
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import subprocess
+import sys
+
+import pytest
+
+import giturlparse
+
+
+def test_version():
+    version_info = giturlparse.version_info
+
+    assert version_info.release_string() == giturlparse.__version__
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        giturlparse.unknown
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='needs -X importtime')
+def test_import_does_not_load_pbr():
+    code = ("import giturlparse; "
+            "giturlparse.parse('git@github.com:owner/repo.git')")
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        stderr=subprocess.STDOUT,
+        universal_newlines=True)
+    modules = [
+        line.rsplit('|', 1)[-1].strip() for line in output.splitlines()
+        if line.startswith('import time:')
+    ]
+
+    assert 'giturlparse' in modules
+    assert not [m for m in modules if m.split('.')[0] == 'pbr']
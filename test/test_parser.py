@@ -20,6 +20,14 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import functools
+import gzip
+import io
+import itertools
+import multiprocessing.pool
+import pickle
+import timeit
+
 import pytest
 
 from giturlparse import parser
@@ -55,19 +63,859 @@ def test_parse_raises_on_invalid_string(invalid_strings):
             p.parse()
 
 
+def test_reusable_parser(first_match_urls, third_match_urls, invalid_strings):
+    urls = list(first_match_urls) + list(third_match_urls)
+    p = parser.Parser()
+
+    expected = [parser.Parser(url).parse() for url in urls]
+    assert expected == [p.parse(url) for url in urls]
+    assert p.parse_many(urls) == parser.parse_many(urls)
+    for url in invalid_strings:
+        assert p.try_parse(url) is None
+        with pytest.raises(parser.ParserError):
+            p.parse(url)
+    with pytest.raises(TypeError):
+        p.parse()
+
+
+def test_reusable_parser_options(first_match_urls):
+    url = next(iter(first_match_urls))
+    p = parser.Parser(fast_path=False, compact=True)
+
+    assert isinstance(p.parse(url), parser.CompactParsed)
+    assert isinstance(p.try_parse(url), parser.CompactParsed)
+    assert p.parse_many([url]) == [parser.Parser(url).parse()]
+    assert parser.Parser('not a url').parse(url) == p.parse(url)
+
+
+def test_reusable_parser_is_thread_safe(first_match_urls):
+    urls = list(first_match_urls) * 50
+    p = parser.Parser()
+    expected = [p.parse(url) for url in urls]
+    pool = multiprocessing.pool.ThreadPool(4)
+    try:
+        results = pool.map(p.parse, urls, chunksize=7)
+    finally:
+        pool.terminate()
+
+    assert expected == results
+
+
 def test_get_protocol_multiple_protocols():
     p = parser.Parser('git+ssh://git@example.com/Owner/Repository.git')
 
-    assert ['git', 'ssh'] == p._get_protocols()
+    assert ('git', 'ssh') == p._get_protocols()
 
 
 def test_get_protocol_no_protocols():
     p = parser.Parser('//example.com/foo')
 
-    assert [] == p._get_protocols()
+    assert () == p._get_protocols()
+
+
+@pytest.mark.parametrize('fast_path', [True, False])
+def test_protocols_are_shared_tuples(fast_path):
+    first = parser.Parser('https://example.com/owner/repo', fast_path).parse()
+    second = parser.Parser('https://github.com/other/repo', fast_path).parse()
+
+    assert ('https', ) == first.protocols
+    assert first.protocols is second.protocols
+    scp = parser.Parser('git@example.com:owner/repo.git', fast_path).parse()
+    assert () == scp.protocols
+
+
+def test_protocols_of_uncommon_schemes():
+    parsed = parser.Parser('foo+bar://example.com/owner/repo').parse()
+
+    assert ('foo', 'bar') == parsed.protocols
 
 
 def test_get_protocol_one_protocols():
     p = parser.Parser('ssh://git@example.com/Owner/Repository.git')
 
-    assert ['ssh'] == p._get_protocols()
+    assert ('ssh', ) == p._get_protocols()
+
+
+def test_parse_many(first_match_urls, third_match_urls):
+    urls = list(first_match_urls) + list(third_match_urls)
+    results = parser.parse_many(iter(urls))
+
+    assert [parser.Parser(url).parse() for url in urls] == results
+
+
+def test_parse_many_returns_errors_in_place(invalid_strings):
+    urls = ['git@example.com:owner/repo.git'] + invalid_strings
+    results = parser.parse_many(urls)
+
+    assert len(urls) == len(results)
+    assert 'repo' == results[0].name
+    for url, result in zip(invalid_strings, results[1:]):
+        assert isinstance(result, parser.ParserError)
+        assert "Invalid URL '{}'".format(url) == str(result)
+
+
+@pytest.mark.parametrize("test_input", [
+    'first_match_urls',
+    'second_match_urls',
+    'third_match_urls',
+    'fourth_match_urls',
+    'invalid_strings',
+])
+def test_match_agrees_with_regex_cascade(request, test_input):
+    urls = list(request.getfixturevalue(test_input))
+    urls += [url + '\n' for url in urls]
+    for url in urls:
+        expected = None
+        for regex in parser.POSSIBLE_REGEXES:
+            expected = regex.search(url)
+            if expected:
+                break
+        match = parser._match(url, url.find('://'))
+
+        assert (expected is None) == (match is None)
+        if match:
+            assert expected.re is match.re
+            assert expected.groupdict() == match.groupdict()
+
+
+@pytest.mark.parametrize("make_input", [
+    lambda n: 'a@' * n,
+    lambda n: 'http://' + 'a@' * n + '!',
+    lambda n: 'a@/' * n + 'x.gi',
+    lambda n: 'a@b:' + 'a/' * n + 'x.git!',
+    lambda n: 'git+ssh://' + 'a.' * n + '!',
+    lambda n: 'a://h:' + '1' * n + '!',
+    lambda n: 'a:/' * n + '!',
+])
+@pytest.mark.parametrize('regex', parser.POSSIBLE_REGEXES)
+def test_search_time_is_linear_on_pathological_input(make_input, regex):
+    def search_time(n):
+        search = functools.partial(regex.search, make_input(n))
+
+        return min(timeit.repeat(search, number=1, repeat=5))
+
+    # Growing the input 8x must not grow the search time quadratically (64x).
+    assert search_time(16000) < 24 * search_time(2000)
+
+
+@pytest.mark.parametrize("test_input", [
+    'first_match_urls',
+    'second_match_urls',
+    'third_match_urls',
+    'fourth_match_urls',
+    'fast_path_declined_urls',
+])
+def test_fast_path_agrees_with_regexes(request, test_input):
+    for url in request.getfixturevalue(test_input):
+        parsed = parser._fast_parse(url, url.find('://'))
+        if parsed is not None:
+            assert parser.Parser(url, fast_path=False).parse() == parsed
+
+
+def test_fast_path_parses_common_shapes():
+    for url in [
+            'https://github.com/owner/repo',
+            'https://github.com/owner/repo.git',
+            'https://github.com/owner/repo/',
+            'https://example.com/repo',
+            'ssh://git@example.com/owner/repo.git',
+            'ssh://git@example.com:29418/owner/repo.git',
+            'git@github.com:owner/repo.git',
+            'git@github.com:/owner/repo.git',
+            'example.com:owner/repo.git',
+    ]:
+        assert parser._fast_parse(url, url.find('://')) is not None
+
+
+def test_fast_path_declines_other_shapes(fast_path_declined_urls):
+    for url in fast_path_declined_urls:
+        assert parser._fast_parse(url, url.find('://')) is None
+
+
+def test_parse_many_without_fast_path(first_match_urls):
+    urls = list(first_match_urls)
+
+    assert parser.parse_many(urls) == parser.parse_many(urls, fast_path=False)
+
+
+def test_lazy_pattern_compiles_on_first_use():
+    regex = parser._LazyPattern(r'(?P<name>b+)')
+    assert regex._regex is None
+
+    assert 'bb' == regex.search('abb').group('name')
+    assert regex._regex is not None
+    assert regex._regex.search == regex.search
+
+
+def test_lazy_pattern_proxies_compiled_pattern():
+    regex = parser._LazyPattern(r'(?P<name>b+)')
+
+    assert regex.match('abb') is None
+    assert {'name': 1} == regex.groupindex
+    assert regex.match('abb', 1)
+
+
+def test_precompile():
+    parser.precompile()
+
+    for regex in parser.POSSIBLE_REGEXES:
+        assert regex.search('') is None
+        if isinstance(regex, parser._LazyPattern):
+            assert regex._regex is not None
+    for regex in parser._BYTES_REGEXES:
+        assert regex._regex is not None
+    assert parser._URL_IN_TEXT._regex is not None
+    for profile in parser._PROFILES.values():
+        assert profile._regex._regex is not None
+
+
+@pytest.mark.parametrize("test_input", [
+    'first_match_urls',
+    'second_match_urls',
+    'third_match_urls',
+    'fourth_match_urls',
+])
+def test_parse_compact(request, test_input):
+    for url, d in request.getfixturevalue(test_input).items():
+        result = parser.Parser(url, compact=True).parse()
+
+        assert isinstance(result, parser.CompactParsed)
+        assert d == result._asdict()
+        assert parser.Parser(url).parse() == result
+
+
+def test_parse_many_compact(first_match_urls, invalid_strings):
+    results = parser.parse_many(
+        list(first_match_urls) + invalid_strings, compact=True)
+
+    assert all(isinstance(r, parser.CompactParsed) for r in results[:-2])
+    assert all(isinstance(r, parser.ParserError) for r in results[-2:])
+
+
+def test_compact_parsed_comparison():
+    parsed = parser.Parser('git+ssh://example.com/owner/repo.git').parse()
+    compact = parser.CompactParsed(parsed)
+
+    assert parsed == compact
+    assert not compact != parsed
+    assert compact != parser.CompactParsed(
+        parser.Parser('git+ssh://example.com/owner/other.git').parse())
+    assert compact != tuple(parsed)
+    assert hash(parsed) == hash(compact)
+    assert {parsed} == {compact}
+
+
+def test_compact_parsed_repr():
+    parsed = parser.Parser('example.com:repo.git').parse()
+
+    assert ('CompactParsed' + repr(parsed)[len('Parsed'):] == repr(
+        parser.CompactParsed(parsed)))
+
+
+def _decode_spans(buf, spans):
+    d = {
+        field: None if span is None else buf[span[0]:span[1]].decode('ascii')
+        for field, span in spans._asdict().items()
+    }
+    d['protocols'] = tuple(d['protocols'].split('+')) if d['protocols'] else ()
+    d['protocol'] = d['protocol'] or 'ssh'
+
+    return d
+
+
+@pytest.mark.parametrize("test_input", [
+    'first_match_urls',
+    'second_match_urls',
+    'third_match_urls',
+    'fourth_match_urls',
+])
+def test_parse_spans(request, test_input):
+    for url, d in request.getfixturevalue(test_input).items():
+        buf = bytearray(b'\0junk ' + url.encode('ascii') + b' \0')
+        start = len(b'\0junk ')
+        spans = parser.parse_spans(buf, start, len(buf) - 2)
+
+        assert isinstance(spans, parser.ParsedSpans)
+        assert d == _decode_spans(bytes(buf), spans)
+
+
+def test_parse_spans_accepts_bytes_like():
+    url = b'git@github.com:owner/repo.git'
+    expected = parser.parse_spans(url)
+
+    assert (0, len(url)) == expected.href
+    assert expected == parser.parse_spans(bytearray(url))
+    assert expected == parser.parse_spans(memoryview(url))
+
+
+def test_parse_spans_raises_on_invalid(invalid_strings):
+    for url in invalid_strings:
+        with pytest.raises(parser.ParserError):
+            parser.parse_spans(url.encode('ascii'))
+
+    with pytest.raises(parser.ParserError) as e:
+        parser.parse_spans(b'\xff invalid')
+    assert u"Invalid URL '\ufffd invalid'" == str(e.value)
+
+
+@pytest.mark.parametrize("test_input", [
+    'first_match_urls',
+    'second_match_urls',
+    'third_match_urls',
+    'fourth_match_urls',
+])
+def test_finditer(request, test_input):
+    urls = list(request.getfixturevalue(test_input))
+    text = ''.join('url = "{}", see ({}).\n'.format(url, url) for url in urls)
+    found = list(parser.finditer(text))
+
+    assert 2 * len(urls) == len(found)
+    for url, (start, end, parsed) in zip(urls * 2, found[::2] + found[1::2]):
+        assert url == text[start:end]
+        assert parser.Parser(url).parse() == parsed
+
+
+def test_finditer_in_files():
+    text = """[submodule "x"]
+\turl = git://example.com/owner/repo.git
+-e git+https://example.com/owner/pip.git@v1.0#egg=pip
+"repository": "git+ssh://git@example.com/owner/npm.git"
+cloned git@example.com:group/sub/repo.git. Done
+plain/path, user@host, a: b, x:y/z and Cargo.toml:1
+"""
+    found = [(text[start:end], parsed.name)
+             for start, end, parsed in parser.finditer(text)]
+
+    assert [
+        ('git://example.com/owner/repo.git', 'repo'),
+        ('git+https://example.com/owner/pip.git', 'pip'),
+        ('git+ssh://git@example.com/owner/npm.git', 'npm'),
+        ('git@example.com:group/sub/repo.git', 'repo'),
+    ] == found
+
+
+def test_finditer_skips_invalid_urls():
+    text = 'ftp://ex!ample x@y:! (ssh://)'
+
+    assert [] == list(parser.finditer(text))
+
+
+def test_parse_stream(first_match_urls, invalid_strings):
+    urls = list(first_match_urls)
+    text = '\n'.join(urls[:2] + ['', 'not a url', ''] + urls[2:]) + '\n'
+    results = list(parser.parse_stream(io.StringIO(text), chunk_size=7))
+
+    linenos = [lineno for lineno, _ in results]
+    assert [1, 2, 4] + list(range(6, len(urls) + 4)) == linenos
+    assert "Invalid URL 'not a url'" == str(results[2][1])
+    parsed = [result for _, result in results[:2] + results[3:]]
+    assert parser.parse_many(urls) == parsed
+
+
+def test_parse_stream_binary():
+    text = u'git@github.com:owner/répo.git\r\nexample.com:repo.git'
+    results = list(
+        parser.parse_stream(
+            io.BytesIO(text.encode('utf-8')), compact=True, chunk_size=3))
+
+    assert [1, 2] == [lineno for lineno, _ in results]
+    assert u'répo' == results[0][1].name
+    assert parser.Parser('example.com:repo.git').parse() == results[1][1]
+
+
+def _gzip_compress(data):
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb') as f:
+        f.write(data)
+
+    return buf.getvalue()
+
+
+def test_parse_stream_gzip(first_match_urls):
+    urls = list(first_match_urls)
+    # Two gzip members, as written by appending to a gzipped file.
+    data = b''.join(
+        _gzip_compress(u''.join(url + u'\n' for url in part).encode('utf-8'))
+        for part in (urls[:3], urls[3:]))
+    results = list(parser.parse_stream(io.BytesIO(data), chunk_size=16))
+
+    assert list(range(1, len(urls) + 1)) == [lineno for lineno, _ in results]
+    assert parser.parse_many(urls) == [result for _, result in results]
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_parse_many_parallel(first_match_urls, third_match_urls,
+                             invalid_strings, compact):
+    urls = list(first_match_urls) + invalid_strings + list(third_match_urls)
+    results = parser.parse_many(urls, compact=compact, workers=2, chunk_size=3)
+
+    result_type = parser.CompactParsed if compact else parser.Parsed
+    assert len(urls) == len(results)
+    for expected, result in zip(parser.parse_many(urls), results):
+        if isinstance(expected, parser.ParserError):
+            assert str(expected) == str(result)
+        else:
+            assert expected == result
+            assert isinstance(result, result_type)
+
+
+def test_parse_stream_parallel(mocker, first_match_urls):
+    mocker.patch('giturlparse.parser.PARALLEL_CHUNK_SIZE', 2)
+    urls = list(first_match_urls)
+    text = '\n\n'.join(urls + ['not a url'])
+    results = list(
+        parser.parse_stream(io.StringIO(text), compact=True, workers=2))
+
+    linenos = [lineno for lineno, _ in results]
+    assert list(range(1, 2 * len(urls) + 2, 2)) == linenos
+    expected = parser.parse_many(urls, compact=True)
+    assert expected == [result for _, result in results[:-1]]
+    assert isinstance(results[-1][1], parser.ParserError)
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_parse_chunk(compact):
+    results = parser._parse_chunk(
+        (['git@github.com:owner/repo.git', 'not a url'], parser._parse, True,
+         compact))
+
+    assert 'ssh' == results[0][1 - compact]
+    assert results[1] is None
+
+
+@pytest.fixture()
+def stats_events():
+    events = []
+    parser.enable_stats(events.append)
+    try:
+        yield events
+    finally:
+        parser.disable_stats()
+
+
+def test_stats(stats_events):
+    parser.parse_many([
+        'https://github.com/owner/repo.git',
+        'git+ssh://example.com:9999/owner/repo.git',
+        'example.com:repo.git',
+        'not a url:!',
+    ])
+    parser.parse_many(['https://github.com/owner/repo.git'], fast_path=False)
+    stats = parser.get_stats()
+
+    assert {'fast_path', 'profiles', 'patterns', 'errors'} == set(stats)
+    counts = [(counters['hits'], counters['misses'])
+              for counters in [stats['fast_path']] + stats['patterns']]
+    assert [(1, 3), (1, 0), (1, 0), (0, 0), (1, 1)] == counts
+    assert 1 == stats['errors']
+    assert all(counters['time'] > 0 for counters in stats['patterns'][:2])
+
+    assert [
+        ('https://github.com/owner/repo.git', True, None, 0),
+        ('git+ssh://example.com:9999/owner/repo.git', False, 1, 0),
+        ('example.com:repo.git', False, 3, 0),
+        ('not a url:!', False, None, 1),
+        ('https://github.com/owner/repo.git', False, 0, 0),
+    ] == [event[:4] for event in stats_events]
+    assert all(event.seconds > 0 for event in stats_events)
+
+
+def test_stats_profiles(stats_events):
+    parser.parse_many([
+        'https://gitlab.com/group/sub/repo.git',
+        'https://gitlab.com',
+        'https://example.com/group/sub/repo.git',
+    ])
+    stats = parser.get_stats()
+
+    assert (1, 1) == (stats['profiles']['hits'], stats['profiles']['misses'])
+    events = [(event.fast_path, event.pattern, event.profile)
+              for event in stats_events]
+    expected = [(False, None, True), (False, 1, False), (False, 2, False)]
+    assert expected == events
+
+
+def test_stats_disabled(stats_events):
+    parser.disable_stats()
+    parser.parse_many(['https://github.com/owner/repo.git'])
+
+    assert 0 == parser.get_stats()['fast_path']['hits']
+    assert [] == stats_events
+
+
+def test_stats_without_callback(stats_events):
+    parser.enable_stats()
+    parser.parse_many(['not a url'])
+
+    assert 1 == parser.get_stats()['errors']
+    assert [] == stats_events
+
+
+def test_parse_many_adaptive(mocker):
+    mocker.patch.object(parser._AdaptiveParse, 'window', 4)
+    mocker.patch.object(parser._AdaptiveParse, 'pause', 8)
+    # A run of URLs the fast path declines, then a run it parses.
+    urls = (['example.com:repo.git'] * 16 +
+            ['https://github.com/owner/repo.git'] * 16)
+    expected = parser.parse_many(urls)
+    fast_parse = mocker.spy(parser, '_fast_parse')
+
+    assert expected == parser.parse_many(urls, adaptive=True)
+    # Tried on 1-4, skipped on 5-12, tried on 13-16, skipped on 17-24, and
+    # tried from then on.
+    assert 16 == fast_parse.call_count
+
+
+@pytest.mark.parametrize('fast_path', [True, False])
+def test_adaptive_parse_counts_stats(stats_events, fast_path):
+    parse = parser._AdaptiveParse()
+    parse('https://github.com/owner/repo.git', fast_path)
+
+    assert fast_path == stats_events[0].fast_path
+
+
+def test_parse_stream_adaptive(third_match_urls):
+    urls = list(third_match_urls)
+    text = '\n'.join(urls)
+    results = parser.parse_stream(io.StringIO(text), adaptive=True)
+
+    assert parser.parse_many(urls) == [result for _, result in results]
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_canonical_key(compact):
+    urls = [
+        'https://github.com/Org/Repo',
+        'https://GitHub.com/org/repo.git',
+        'git@github.com:Org/Repo.git',
+        'ssh://git@github.com:22/Org/Repo.git',
+        'git+ssh://github.com/Org/Repo.git',
+    ]
+    keys = {
+        result.canonical_key()
+        for result in parser.parse_many(urls, compact=compact)
+    }
+
+    assert {parser.RepoKey('github.com', 'org', 'repo')} == keys
+
+
+def test_canonical_key_of_host_profiles():
+    urls = [
+        'https://dev.azure.com/Org/Project/_git/Repo',
+        'git@ssh.dev.azure.com:v3/org/project/repo',
+    ]
+    keys = {result.canonical_key() for result in parser.parse_many(urls)}
+
+    assert {parser.RepoKey('dev.azure.com', 'org/project', 'repo')} == keys
+
+
+def test_canonical_key_without_owner_or_name():
+    assert (parser.RepoKey('example.com', None, 'repo') == parser.Parser(
+        'Example.com:Repo.git').parse().canonical_key())
+    assert (parser.RepoKey(
+        'github.com', None,
+        None) == parser.Parser('https://github.com/').parse().canonical_key())
+
+
+def test_parse_many_intern():
+    urls = [
+        'git+ssh://git@github.com/owner/repo{}.git'.format(i) for i in range(3)
+    ] + ['not a url']
+    results = parser.parse_many(urls, intern=True)
+
+    assert parser.parse_many(urls[:3]) == results[:3]
+    assert isinstance(results[3], parser.ParserError)
+    first, second = results[:2]
+    assert first.resource is second.resource
+    assert first.user is second.user
+    assert first.owner is second.owner
+    assert first.protocols is second.protocols
+
+
+def test_parse_many_intern_shares_table_between_calls():
+    table = {}
+    url = 'git@github.com:owner/repo.git'
+    first = parser.parse_many([url], intern=table)[0]
+    second = parser.parse_many([url], intern=table, workers=2)[0]
+
+    assert first.owner is second.owner
+    assert first.protocols is second.protocols
+
+
+def test_parse_many_intern_ignored_when_compact():
+    url = 'git@github.com:owner/repo.git'
+    results = parser.parse_many([url], compact=True, intern=True)
+
+    assert isinstance(results[0], parser.CompactParsed)
+
+
+def test_parse_many_intern_ignored_when_columnar():
+    urls = ['git@github.com:owner/repo.git', 'not a url']
+    result = parser.parse_many(urls, columnar=True, intern=True)
+
+    assert parser.parse_many(urls, columnar=True) == result
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parse_many_columnar(first_match_urls, workers):
+    urls = list(first_match_urls)[:3] + ['not a url']
+    result = parser.parse_many(urls, columnar=True, workers=workers)
+
+    assert isinstance(result, parser.ParsedColumns)
+    assert [1, 1, 1, 0] == list(result.valid)
+    assert list(parser.Parsed._fields) == list(result.columns)
+    rows = [list(row) for row in parser.parse_many(urls[:3])]
+    assert rows + [[None] * 9] == [
+        list(row) for row in zip(*result.columns.values())
+    ]
+    assert {} == result.dictionaries
+
+
+def test_parse_many_columnar_dictionary():
+    urls = [
+        'https://github.com/owner/repo.git',
+        'git@github.com:owner/other.git',
+        'https://gitlab.com/owner/repo.git',
+        'not a url',
+        'example.com:repo.git',
+    ]
+    result = parser.parse_many(
+        urls,
+        columnar=True,
+        dictionary=('protocols', 'protocol', 'resource', 'owner'))
+
+    assert [0, 1, 0, -1, 1] == list(result.columns['protocols'])
+    assert [('https', ), ()] == result.dictionaries['protocols']
+    assert [0, 1, 0, -1, 1] == list(result.columns['protocol'])
+    assert ['https', 'ssh'] == result.dictionaries['protocol']
+    assert [0, 0, 1, -1, 2] == list(result.columns['resource'])
+    assert ['github.com', 'gitlab.com',
+            'example.com'] == result.dictionaries['resource']
+    assert [0, 0, 0, -1, -1] == list(result.columns['owner'])
+    assert ['repo', 'other', 'repo', None, 'repo'] == result.columns['name']
+
+
+def test_parse_many_columnar_rejects_dictionary():
+    with pytest.raises(ValueError):
+        parser.parse_many([], columnar=True, dictionary=('colour', ))
+
+
+def test_try_parse(invalid_strings):
+    url = 'git@github.com:owner/repo.git'
+
+    assert parser.Parser(url).parse() == parser.try_parse(url)
+    assert parser.try_parse(url, fast_path=False) == parser.try_parse(url)
+    for url in invalid_strings:
+        assert parser.try_parse(url) is None
+
+
+@pytest.mark.parametrize('url', [
+    'not a url',
+    'see the docs at https://example.com/owner/repo.git for details',
+    '   ',
+    '',
+])
+def test_may_match_rejects_without_patterns(url):
+    assert not parser._may_match(url)
+    assert () == parser._candidates(url, url.find('://'))
+
+
+def test_may_match_is_necessary(first_match_urls, second_match_urls,
+                                third_match_urls, fourth_match_urls):
+    urls = (list(first_match_urls) + list(second_match_urls) +
+            list(third_match_urls) + list(fourth_match_urls))
+    words = ['a', 'b c', ' ', '@', ':', '/', '.git', 'git', '\n', '//', '\t']
+    # Every combination of up to three words, along with the fixtures, with
+    # and without a trailing newline.
+    urls += [''.join(p) for p in itertools.product(words, repeat=3)]
+    for url in urls + [url + '\n' for url in urls]:
+        if not parser._may_match(url):
+            assert not any(
+                regex.search(url) for regex in parser.POSSIBLE_REGEXES), url
+
+
+@pytest.fixture()
+def bitbucket_server():
+    parser.register_host('bitbucket.example.com', parser.BITBUCKET_SERVER)
+    try:
+        yield
+    finally:
+        parser.unregister_host('bitbucket.example.com')
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://gitlab.com/group/sub/sub2/repo.git', ('group/sub/sub2', 'repo')),
+    ('git@gitlab.com:group/sub/repo.git', ('group/sub', 'repo')),
+    ('ssh://git@gitlab.com:2222/owner/repo/', ('owner', 'repo')),
+    ('https://gitlab.com/repo', (None, 'repo')),
+    ('https://org@dev.azure.com/org/my%20project/_git/repo',
+     ('org/my%20project', 'repo')),
+    ('git@ssh.dev.azure.com:v3/org/project/repo', ('org/project', 'repo')),
+    ('https://bitbucket.example.com/scm/project/repo.git',
+     ('project', 'repo')),
+    ('ssh://git@bitbucket.example.com:7999/~user/repo.git', ('~user', 'repo')),
+])
+def test_host_profiles(bitbucket_server, url, expected):
+    parsed = parser.Parser(url).parse()
+
+    assert expected == (parsed.owner, parsed.name)
+    assert url == parsed.href
+    assert url.endswith(parsed.pathname)
+    assert parsed == parser.Parser(url, fast_path=False).parse()
+    assert parsed == parser.Parser(url, compact=True).parse()
+
+
+def test_host_profiles_agree_with_fast_path(bitbucket_server):
+    for url in [
+            'https://gitlab.com/owner/repo.git',
+            'https://user@gitlab.com:8443/owner/repo',
+            'git@gitlab.com:owner/repo.git',
+            'gitlab.com:/owner/repo.git',
+            'https://dev.azure.com/org/repo',
+            'https://dev.azure.com:8443/org/repo',
+            'https://git@dev.azure.com:7999/o_1/r_1',
+            'ssh://git@ssh.dev.azure.com:22/org/repo.git',
+            'https://bitbucket.example.com:7990/repo',
+            'ssh://git@bitbucket.example.com:7999/owner/repo.git',
+            'git@bitbucket.example.com:owner/repo.git',
+    ]:
+        parsed = parser._fast_parse(url, url.find('://'))
+
+        assert parsed is not None
+        assert parser.Parser(url, fast_path=False).parse() == parsed
+
+
+def test_host_profile_falls_back_to_regexes():
+    parsed = parser.Parser('https://gitlab.com').parse()
+
+    assert 'gitlab.com' == parsed.resource
+    assert parsed.name is None
+
+
+def test_fast_path_declines_hosts_with_profiles(mocker):
+    mocker.patch.dict(parser._PROFILES,
+                      {'example.com': parser.HostProfile(r'(?P<name>\w+)')})
+
+    assert parser._fast_parse('https://example.com/owner/repo', 5) is None
+    assert parser._fast_parse('git@example.com:owner/repo.git', -1) is None
+
+
+def test_register_host(mocker):
+    mocker.patch.object(parser, '_PROFILES', {})
+    path = r'(?P<owner>\w+)/(?P<name>\w+)/-'
+    profile = parser.HostProfile(path)
+    parser.register_host('example.com', profile)
+    parsed = parser.Parser('https://example.com/owner/repo/-').parse()
+
+    assert ('owner', 'repo') == (parsed.owner, parsed.name)
+    expected = ('HostProfile({!r}, fast_path=False, templates={{}}, '
+                'protocols=None, canonical_host=None)')
+    assert expected.format(path) == repr(profile)
+
+    parser.unregister_host('example.com')
+    with pytest.raises(KeyError):
+        parser.unregister_host('example.com')
+
+
+def test_host_profiles_in_workers(bitbucket_server):
+    urls = ['https://bitbucket.example.com/scm/project/repo.git'] * 3
+    results = parser.parse_many(urls, workers=2, chunk_size=1)
+
+    assert ['project'] * 3 == [result.owner for result in results]
+
+
+def test_init_worker(mocker):
+    mocker.patch.object(parser, '_PROFILES', {})
+    profiles = pickle.loads(pickle.dumps({'example.com': parser.GITLAB}))
+    parser._init_worker(profiles)
+
+    assert parser.GITLAB.path == parser._PROFILES['example.com'].path
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_format(compact):
+    parsed = parser.Parser(
+        'https://user@github.com:8443/owner/repo', compact=compact).parse()
+
+    assert 'git@github.com:owner/repo.git' == parsed.to_ssh()
+    assert 'github.com:owner/repo.git' == parsed.to_ssh(user='')
+    assert 'ssh://me@github.com:22/owner/repo.git' == parsed.to_ssh('me', 22)
+    assert 'https://github.com/owner/repo.git' == parsed.to_https()
+    assert 'http://me@github.com:80/owner/repo.git' == parsed.format(
+        'http', 'me', 80)
+    assert 'git://github.com/owner/repo.git' == parsed.format('git')
+
+
+@pytest.mark.parametrize('url, ssh, https', [
+    ('example.com:repo.git', 'git@example.com:repo.git',
+     'https://example.com/repo.git'),
+    ('https://gitlab.com/group/sub/repo', 'git@gitlab.com:group/sub/repo.git',
+     'https://gitlab.com/group/sub/repo.git'),
+    ('git@ssh.dev.azure.com:v3/org/project/repo',
+     'git@ssh.dev.azure.com:v3/org/project/repo',
+     'https://dev.azure.com/org/project/_git/repo'),
+    ('ssh://git@bitbucket.example.com:7999/project/repo.git',
+     'git@bitbucket.example.com:project/repo.git',
+     'https://bitbucket.example.com/scm/project/repo.git'),
+])
+def test_format_hosts(bitbucket_server, url, ssh, https):
+    parsed = parser.Parser(url).parse()
+
+    assert ssh == parsed.to_ssh()
+    assert https == parsed.to_https()
+
+
+def test_format_round_trips(first_match_urls, second_match_urls,
+                            third_match_urls, fourth_match_urls):
+    for fixture in (first_match_urls, second_match_urls, third_match_urls,
+                    fourth_match_urls):
+        for url in fixture:
+            parsed = parser.Parser(url).parse()
+            for protocol in ('https', 'http', 'git', 'ssh'):
+                formatted = parsed.format(protocol)
+                key = parser.Parser(formatted).parse().canonical_key()
+
+                assert parsed.canonical_key() == key
+
+
+def test_format_raises():
+    parsed = parser.Parser('https://example.com').parse()
+
+    with pytest.raises(ValueError):
+        parsed.to_https()
+    with pytest.raises(ValueError) as e:
+        parser.Parser('git@example.com:owner/repo.git').parse().format('ftp')
+    assert "Unknown protocol 'ftp'" == str(e.value)
+
+
+def test_format_raises_for_host_profiles():
+    parsed = parser.Parser('https://dev.azure.com/repo').parse()
+
+    assert parsed.owner is None
+    with pytest.raises(ValueError) as e:
+        parsed.to_https()
+    assert ("Can't format a URL on 'dev.azure.com' without an owner" == str(
+        e.value))
+    with pytest.raises(ValueError):
+        parsed.to_ssh()
+
+    parsed = parser.Parser('git@ssh.dev.azure.com:v3/org/proj/repo').parse()
+    with pytest.raises(ValueError) as e:
+        parsed.format('git')
+    assert "'ssh.dev.azure.com' isn't served over 'git'" == str(e.value)
+    with pytest.raises(ValueError):
+        parsed.format('http')
+
+
+def test_rewrite_many(first_match_urls, invalid_strings):
+    urls = list(first_match_urls) + invalid_strings + ['https://example.com']
+    results = parser.rewrite_many(urls, 'ssh', port=22, fast_path=False)
+
+    expected = [
+        parser.Parser(url).parse().to_ssh(port=22) for url in first_match_urls
+    ]
+    assert expected == results[:len(expected)]
+    assert isinstance(results[-3], parser.ParserError)
+    assert isinstance(results[-1], ValueError)
+    with pytest.raises(ValueError):
+        parser.rewrite_many(urls, 'ftp')